@@ -0,0 +1,133 @@
+"""
+Compares CPU throughput of the HF IndicTrans2 models with eager attention, SDPA attention and
+SDPA with `torch.compile`d encoder/decoder layers (`INDICTRANS_ATTN_IMPLEMENTATION` and
+`INDICTRANS_TORCH_COMPILE` in `inference_server.py`).
+
+Each mode loads a fresh model, warms it up on the corpus (which also triggers compilation) and
+then translates the corpus `--repeats` times.
+
+Usage (from the IndicTrans2 directory):
+    python benchmarks/bench_attention.py --ckpt ai4bharat/indictrans2-en-indic-dist-200M --threads 4
+    python benchmarks/bench_attention.py --ckpt ai4bharat/indictrans2-indic-en-dist-200M --src-lang hin_Deva --tgt-lang eng_Latn --modes eager sdpa
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+import torch
+from transformers import AutoTokenizer
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from huggingface_interface.modeling_indictrans import IndicTransForConditionalGeneration, compile_encoder_decoder_layers
+
+MODES = {
+    "eager": ("eager", False),
+    "sdpa": ("sdpa", False),
+    "sdpa-compiled": ("sdpa", True),
+}
+CORPUS = {
+    "eng_Latn": [
+        "Good morning!",
+        "Your dog looks like it just lost an argument with a vacuum cleaner.",
+        "This cat has more attitude than a Bollywood villain.",
+        "When I was young, I used to go to the park every day.",
+        "He has many old books, which he inherited from his ancestors.",
+        "We watched a new movie last week, which was very inspiring.",
+        "This majestic creature spends its entire day guarding the sofa from imaginary intruders, "
+        "demanding treats on an hourly schedule and shedding on every freshly washed piece of clothing.",
+        "Raj told me that he is going to his grandmother's house next month.",
+    ],
+    "hin_Deva": [
+        "सुप्रभात!",
+        "जब मैं छोटा था, मैं हर रोज़ पार्क जाता था।",
+        "उसके पास बहुत सारी पुरानी किताबें हैं, जिन्हें उसने अपने दादा-परदादा से विरासत में पाया।",
+        "मुझे समझ में नहीं आ रहा कि मैं अपनी समस्या का समाधान कैसे ढूंढूं।",
+        "हमने पिछले सप्ताह एक नई फिल्म देखी जो कि बहुत प्रेरणादायक थी।",
+        "राज ने मुझसे कहा कि वह अगले महीने अपनी नानी के घर जा रहा है।",
+    ],
+}
+
+
+def run_corpus(model, tokenizer, batches: List[List[str]], num_beams: int) -> int:
+    """Translates pre-tagged batches and returns the number of generated tokens."""
+    generated_tokens = 0
+    for batch in batches:
+        inputs = tokenizer(batch, padding="longest", return_tensors="pt", return_attention_mask=True)
+        with torch.no_grad():
+            outputs = model.generate(**inputs, use_cache=True, max_length=256, num_beams=num_beams)
+        generated_tokens += int(outputs.ne(tokenizer.pad_token_id).sum())
+    return generated_tokens
+
+
+def bench_mode(args, tokenizer, batches: List[List[str]], attn_implementation: str, compiled: bool) -> Dict[str, float]:
+    model = IndicTransForConditionalGeneration.from_pretrained(
+        args.ckpt, torch_dtype=torch.float32, attn_implementation=attn_implementation
+    )
+    model.eval()
+    if compiled:
+        compile_encoder_decoder_layers(model, dynamic=True)
+
+    start_time = time.perf_counter()
+    run_corpus(model, tokenizer, batches, args.num_beams)
+    warm_up_seconds = time.perf_counter() - start_time
+
+    num_sentences = sum(len(batch) for batch in batches) * args.repeats
+    generated_tokens = 0
+    start_time = time.perf_counter()
+    for _ in range(args.repeats):
+        generated_tokens += run_corpus(model, tokenizer, batches, args.num_beams)
+    seconds = time.perf_counter() - start_time
+    return {
+        "warm_up_seconds": round(warm_up_seconds, 2),
+        "seconds": round(seconds, 3),
+        "sentences_per_second": round(num_sentences / seconds, 2),
+        "tokens_per_second": round(generated_tokens / seconds, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ckpt", required=True, help="HF checkpoint name or path")
+    parser.add_argument("--src-lang", default="eng_Latn", choices=sorted(CORPUS))
+    parser.add_argument("--tgt-lang", default="hin_Deva")
+    parser.add_argument("--modes", nargs="+", default=list(MODES), choices=list(MODES))
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--num-beams", type=int, default=5)
+    parser.add_argument("--repeats", type=int, default=3, help="timed passes over the corpus per mode")
+    parser.add_argument("--threads", type=int, help="torch intra-op threads")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    # model inputs are prefixed with the language tags, as IndicProcessor does
+    sents = [f"{args.src_lang} {args.tgt_lang} {sent}" for sent in CORPUS[args.src_lang]]
+    batches = [sents[start : start + args.batch_size] for start in range(0, len(sents), args.batch_size)]
+    tokenizer = AutoTokenizer.from_pretrained(args.ckpt, trust_remote_code=True)
+
+    results = {
+        "ckpt": args.ckpt,
+        "threads": torch.get_num_threads(),
+        "batch_size": args.batch_size,
+        "num_beams": args.num_beams,
+        "modes": {},
+    }
+    for mode in args.modes:
+        attn_implementation, compiled = MODES[mode]
+        results["modes"][mode] = bench_mode(args, tokenizer, batches, attn_implementation, compiled)
+
+    if "eager" in results["modes"]:
+        eager_throughput = results["modes"]["eager"]["sentences_per_second"]
+        for row in results["modes"].values():
+            row["speedup_vs_eager"] = round(row["sentences_per_second"] / eager_throughput, 2)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,127 @@
+"""
+Measures the padding waste of decoding batches built in arrival order versus batches
+built after sorting sentences by SPM length (`Model(length_bucketing=True)`).
+
+Padding is counted for fixed-size batches of `--batch-size` sentences, as used by the
+fairseq backend. With `--ckpt-dir`, the end-to-end translation time of both modes is
+measured as well.
+
+Usage (from the IndicTrans2 directory):
+    python benchmarks/bench_length_bucketing.py --spm <ckpt_dir>/vocab/model.SRC
+    python benchmarks/bench_length_bucketing.py --ckpt-dir <ckpt_dir> --model-type fairseq --src-lang eng_Latn --tgt-lang hin_Deva
+"""
+
+import argparse
+import json
+import os
+import random
+import sys
+import time
+from typing import Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SHORT_SENTENCES = [
+    "Good morning!",
+    "#PetRoast",
+    "Nice try, buddy.",
+    "Who's a good boy?",
+    "Not this one.",
+]
+LONG_SENTENCE = (
+    "This majestic creature spends its entire day guarding the sofa from imaginary intruders, "
+    "demanding treats on an hourly schedule, shedding on every freshly washed piece of clothing "
+    "and then looking at you as if you were the one who ruined the carpet"
+)
+
+
+def synthetic_corpus(num_sentences: int, seed: int = 0) -> List[str]:
+    """Mixes short roast lines with long sentences of varying length, like real request batches."""
+    rng = random.Random(seed)
+    words = LONG_SENTENCE.split()
+    corpus = []
+    for _ in range(num_sentences):
+        if rng.random() < 0.6:
+            corpus.append(rng.choice(SHORT_SENTENCES))
+        else:
+            corpus.append(" ".join(words[: rng.randint(8, len(words))]) + ".")
+    return corpus
+
+
+def padding_stats(lengths: List[int], batch_size: int) -> Dict[str, float]:
+    """Counts real and padded token slots when `lengths` is split into consecutive batches."""
+    real_tokens, padded_tokens = 0, 0
+    for start in range(0, len(lengths), batch_size):
+        batch = lengths[start : start + batch_size]
+        real_tokens += sum(batch)
+        padded_tokens += max(batch) * len(batch)
+    return {
+        "real_tokens": real_tokens,
+        "padded_tokens": padded_tokens,
+        "padding_waste_pct": round(100 * (padded_tokens - real_tokens) / padded_tokens, 2),
+    }
+
+
+def time_model(args, sents: List[str]) -> Dict[str, float]:
+    from inference.engine import Model
+
+    timings = {}
+    for length_bucketing in (False, True):
+        model = Model(
+            args.ckpt_dir,
+            device=args.device,
+            model_type=args.model_type,
+            cache_size=0,
+            length_bucketing=length_bucketing,
+        )
+        model.batch_translate(sents[:8], args.src_lang, args.tgt_lang)
+        start_time = time.perf_counter()
+        model.batch_translate(list(sents), args.src_lang, args.tgt_lang)
+        key = "bucketed_seconds" if length_bucketing else "arrival_order_seconds"
+        timings[key] = round(time.perf_counter() - start_time, 3)
+        model.close()
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--input", help="file with one sentence per line (defaults: synthetic corpus)")
+    parser.add_argument("--num-sentences", type=int, default=1000, help="size of the synthetic corpus")
+    parser.add_argument("--spm", help="SPM model used to count tokens (defaults: whitespace tokens)")
+    parser.add_argument("--batch-size", type=int, default=100, help="sentences per decoding batch")
+    parser.add_argument("--ckpt-dir", help="also time translation with this checkpoint")
+    parser.add_argument("--model-type", default="ctranslate2", choices=["ctranslate2", "fairseq"])
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--src-lang", default="eng_Latn")
+    parser.add_argument("--tgt-lang", default="hin_Deva")
+    args = parser.parse_args()
+
+    if args.input:
+        with open(args.input, "r", encoding="utf-8") as f:
+            sents = [line.strip() for line in f if line.strip()]
+    else:
+        sents = synthetic_corpus(args.num_sentences)
+
+    if args.spm:
+        import sentencepiece as spm
+
+        sp = spm.SentencePieceProcessor(model_file=args.spm)
+        lengths = [len(tokens) for tokens in sp.encode(sents, out_type=str)]
+    else:
+        lengths = [len(sent.split()) for sent in sents]
+
+    results = {
+        "sentences": len(sents),
+        "batch_size": args.batch_size,
+        "token_counts": "spm" if args.spm else "whitespace",
+        "arrival_order": padding_stats(lengths, args.batch_size),
+        "bucketed": padding_stats(sorted(lengths), args.batch_size),
+    }
+    if args.ckpt_dir:
+        results["timings"] = time_model(args, sents)
+
+    print(json.dumps(results, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,102 @@
+"""
+Benchmarks English sentence splitting in `inference.engine.split_sentences`.
+
+Compares the original implementation, which starts a Moses sentence splitter process
+for every paragraph, with the pooled splitter and single-sentence fast path.
+
+Usage (from the IndicTrans2 directory):
+    python benchmarks/bench_split_sentences.py --repeats 50
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mosestokenizer import MosesSentenceSplitter
+from nltk.tokenize import sent_tokenize
+
+from inference.engine import split_sentences
+from inference.flores_codes_map_indic import flores_codes
+
+PARAGRAPHS = {
+    "short": [
+        "Good morning!",
+        "Your dog looks like it just lost an argument with a vacuum cleaner",
+        "This cat has more attitude than a Bollywood villain.",
+        "#PetRoast @fluffy strikes again",
+        "Who's a good boy? Definitely not this one.",
+    ],
+    "long": [
+        "When I was young, I used to go to the park every day. He has many old books, which he "
+        "inherited from his ancestors. I can't figure out how to solve my problem. She is very "
+        "hardworking and intelligent, which is why she got all the good marks.",
+        "We watched a new movie last week, which was very inspiring. If you had met me at that "
+        "time, we would have gone out to eat. Mr. Sharma went to the market at 5 p.m. to buy a "
+        "new sari. Raj told me that he is going to his grandmother's house next month!",
+    ],
+}
+
+
+def legacy_split_sentences(paragraph: str, lang: str = "eng_Latn") -> List[str]:
+    """The original implementation: one Moses process per call plus NLTK."""
+    with MosesSentenceSplitter(flores_codes[lang]) as splitter:
+        sents_moses = splitter([paragraph])
+    sents_nltk = sent_tokenize(paragraph)
+    if len(sents_nltk) < len(sents_moses):
+        sents = sents_nltk
+    else:
+        sents = sents_moses
+    return [sent.replace("\xad", "") for sent in sents]
+
+
+def time_per_paragraph(fn: Callable[[str], List[str]], paragraphs: List[str], repeats: int) -> float:
+    """Returns the mean wall-clock milliseconds spent per paragraph."""
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        for paragraph in paragraphs:
+            fn(paragraph)
+    return (time.perf_counter() - start_time) * 1000 / (repeats * len(paragraphs))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeats", type=int, default=20, help="passes over the paragraph set per variant")
+    parser.add_argument("--json", action="store_true", help="print results as JSON")
+    args = parser.parse_args()
+
+    # warm up NLTK's punkt model and the splitter pool so that one-off setup is not measured
+    split_sentences(PARAGRAPHS["long"][0], "eng_Latn")
+    legacy_split_sentences(PARAGRAPHS["long"][0])
+
+    results: Dict[str, Dict[str, float]] = {}
+    for name, paragraphs in PARAGRAPHS.items():
+        for paragraph in paragraphs:
+            assert split_sentences(paragraph, "eng_Latn") == legacy_split_sentences(paragraph), paragraph
+
+        before = time_per_paragraph(legacy_split_sentences, paragraphs, args.repeats)
+        after = time_per_paragraph(lambda p: split_sentences(p, "eng_Latn"), paragraphs, args.repeats)
+        results[name] = {
+            "before_ms_per_paragraph": round(before, 3),
+            "after_ms_per_paragraph": round(after, 3),
+            "speedup": round(before / after, 1) if after else float("inf"),
+        }
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+        return
+
+    print(f"{'paragraphs':<12}{'before (ms)':>14}{'after (ms)':>14}{'speedup':>10}")
+    for name, row in results.items():
+        print(
+            f"{name:<12}{row['before_ms_per_paragraph']:>14}"
+            f"{row['after_ms_per_paragraph']:>14}{row['speedup']:>9}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,254 @@
+"""
+Translation throughput and latency benchmark for the IndicTrans2 backends.
+
+Runs a fixed multilingual corpus through `engine.Model` (ctranslate2 or fairseq checkpoints) and
+the HF `IndicTransForConditionalGeneration` path served by `inference_server.py` over a grid of
+batch sizes, beam sizes and thread counts, and prints one JSON record per configuration with
+sentences/s, generated tokens/s, p50/p99 batch latency and the peak RSS of the process. Save the
+output to compare runs across changes.
+
+Beam sizes are passed to the engine as decoding profiles of the benchmarked model (`beam<N>`) for
+the ctranslate2 backend; the fairseq backend keeps the beam size of its generator. Generated
+tokens are counted from the raw hypotheses of the translator. The sentence cache is disabled so
+repeated passes measure decoding. Peak RSS is the process high-water mark, so it only grows across the
+configurations of one run; run one `--threads` value per process when memory numbers must be
+compared.
+
+Usage (from the IndicTrans2 directory):
+    python benchmarks/bench_translation.py --backend ctranslate2 --ckpt-dir <ct2_ckpt_dir> --direction en-indic
+    python benchmarks/bench_translation.py --backend hf --hf-ckpt ai4bharat/indictrans2-indic-en-dist-200M \\
+        --direction indic-en --batch-sizes 1 8 --beam-sizes 1 5 --threads 1 4 --output results.json
+"""
+
+import argparse
+import json
+import os
+import resource
+import sys
+import time
+from typing import Callable, Dict, List, Tuple
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+CORPUS = {
+    "eng_Latn": [
+        "Good morning!",
+        "#PetRoast @fluffy strikes again",
+        "Your dog looks like it just lost an argument with a vacuum cleaner.",
+        "This cat has more attitude than a Bollywood villain.",
+        "When I was young, I used to go to the park every day.",
+        "He has many old books, which he inherited from his ancestors.",
+        "Mr. Sharma went to the market at 5 p.m. to buy a new sari.",
+        "We watched a new movie last week, which was very inspiring.",
+        "This majestic creature spends its entire day guarding the sofa from imaginary intruders, "
+        "demanding treats on an hourly schedule and shedding on every freshly washed piece of clothing.",
+        "Raj told me that he is going to his grandmother's house next month.",
+    ],
+    "hin_Deva": [
+        "सुप्रभात!",
+        "जब मैं छोटा था, मैं हर रोज़ पार्क जाता था।",
+        "उसके पास बहुत सारी पुरानी किताबें हैं, जिन्हें उसने अपने दादा-परदादा से विरासत में पाया।",
+        "मुझे समझ में नहीं आ रहा कि मैं अपनी समस्या का समाधान कैसे ढूंढूं।",
+        "वह बहुत मेहनती और समझदार है, इसलिए उसे सभी अच्छे मार्क्स मिले।",
+        "हमने पिछले सप्ताह एक नई फिल्म देखी जो कि बहुत प्रेरणादायक थी।",
+        "राज ने मुझसे कहा कि वह अगले महीने अपनी नानी के घर जा रहा है।",
+    ],
+    "tam_Taml": [
+        "காலை வணக்கம்!",
+        "நான் சிறுவனாக இருந்தபோது, ஒவ்வொரு நாளும் பூங்காவுக்குச் செல்வேன்.",
+        "அவரிடம் பல பழைய புத்தகங்கள் உள்ளன, அவற்றை அவர் தனது முன்னோர்களிடமிருந்து பெற்றார்.",
+        "கடந்த வாரம் நாங்கள் ஒரு புதிய திரைப்படத்தைப் பார்த்தோம், அது மிகவும் ஊக்கமளிப்பதாக இருந்தது.",
+    ],
+    "ben_Beng": [
+        "সুপ্রভাত!",
+        "আমি যখন ছোট ছিলাম, আমি প্রতিদিন পার্কে যেতাম।",
+        "তার কাছে অনেক পুরনো বই আছে, যা সে তার পূর্বপুরুষদের কাছ থেকে পেয়েছে।",
+        "গত সপ্তাহে আমরা একটি নতুন সিনেমা দেখেছি, যা খুবই অনুপ্রেরণাদায়ক ছিল।",
+    ],
+}
+DIRECTION_PAIRS = {
+    "en-indic": [("eng_Latn", "hin_Deva"), ("eng_Latn", "tam_Taml"), ("eng_Latn", "ben_Beng")],
+    "indic-en": [("hin_Deva", "eng_Latn"), ("tam_Taml", "eng_Latn"), ("ben_Beng", "eng_Latn")],
+    "indic-indic": [("hin_Deva", "tam_Taml"), ("tam_Taml", "ben_Beng"), ("ben_Beng", "hin_Deva")],
+}
+
+# translate(batch, src_lang, tgt_lang, beam_size) -> (translations, generated tokens)
+TranslateFn = Callable[[List[str], str, str, int], Tuple[List[str], int]]
+
+
+def peak_rss_mb() -> float:
+    """Peak resident set size of this process (ru_maxrss is in KiB on Linux)."""
+    return round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+
+def percentile(values: List[float], pct: float) -> float:
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def engine_translate_fn(args, threads: int) -> TranslateFn:
+    from inference.engine import DecodingProfile, Model
+
+    # profiles of this benchmark only, the engine's `DECODING_PROFILES` stay untouched
+    decoding_profiles = {
+        f"beam{beam_size}": DecodingProfile(beam_size, length_ratio=3.0, length_margin=16)
+        for beam_size in args.beam_sizes
+    }
+    model = Model(
+        args.ckpt_dir,
+        device=args.device,
+        model_type=args.backend,
+        cache_size=0,
+        decoding_profile=f"beam{args.beam_sizes[0]}",
+        decoding_profiles=decoding_profiles,
+        intra_threads=threads,
+    )
+    if args.backend == "fairseq":
+        import torch
+
+        torch.set_num_threads(threads)
+
+    # count the tokens of the raw hypotheses (space separated SPM pieces) returned by the
+    # translator, before they are decoded and postprocessed
+    generated_tokens = [0]
+    translate_lines = model.translate_lines
+
+    def counting_translate_lines(lines, decoding_profile):
+        outputs = translate_lines(lines, decoding_profile)
+        generated_tokens[0] += sum(len(output.split()) for output in outputs)
+        return outputs
+
+    model.translate_lines = counting_translate_lines
+
+    def translate(batch, src_lang, tgt_lang, beam_size):
+        generated_tokens[0] = 0
+        translations = model.batch_translate(batch, src_lang, tgt_lang, decoding_profile=f"beam{beam_size}")
+        return translations, generated_tokens[0]
+
+    return translate
+
+
+def hf_translate_fn(args, threads: int) -> TranslateFn:
+    import torch
+    from transformers import AutoTokenizer
+    from IndicTransToolkit.processor import IndicProcessor
+    from huggingface_interface.modeling_indictrans import IndicTransForConditionalGeneration
+
+    torch.set_num_threads(threads)
+    ip = IndicProcessor(inference=True)
+    tokenizer = AutoTokenizer.from_pretrained(args.hf_ckpt, trust_remote_code=True)
+    # the model class and CPU defaults of inference_server.py: SDPA attention and the static KV cache
+    load_kwargs = {"attn_implementation": "sdpa"} if args.device == "cpu" else {}
+    model = IndicTransForConditionalGeneration.from_pretrained(args.hf_ckpt, **load_kwargs).to(args.device)
+    model.eval()
+    if args.device == "cpu":
+        model.enable_static_cache()
+
+    def translate(batch, src_lang, tgt_lang, beam_size):
+        inputs = tokenizer(
+            ip.preprocess_batch(batch, src_lang, tgt_lang),
+            truncation=True,
+            padding="longest",
+            return_tensors="pt",
+            return_attention_mask=True,
+        ).to(args.device)
+        with torch.no_grad():
+            outputs = model.generate(**inputs, use_cache=True, min_length=0, max_length=256, num_beams=beam_size)
+        generated_tokens = int(outputs.ne(tokenizer.pad_token_id).sum())
+        with tokenizer.as_target_tokenizer():
+            decoded = tokenizer.batch_decode(
+                outputs.tolist(), skip_special_tokens=True, clean_up_tokenization_spaces=True
+            )
+        return ip.postprocess_batch(decoded, lang=tgt_lang), generated_tokens
+
+    return translate
+
+
+def run_config(translate: TranslateFn, jobs, batch_size: int, beam_size: int, repeats: int) -> Dict[str, float]:
+    """Translates every (sentences, src_lang, tgt_lang) job in batches and aggregates the timings."""
+    latencies, num_sentences, generated_tokens = [], 0, 0
+    start_time = time.perf_counter()
+    for _ in range(repeats):
+        for sents, src_lang, tgt_lang in jobs:
+            for start in range(0, len(sents), batch_size):
+                batch = sents[start : start + batch_size]
+                batch_start_time = time.perf_counter()
+                _, batch_tokens = translate(batch, src_lang, tgt_lang, beam_size)
+                latencies.append(time.perf_counter() - batch_start_time)
+                num_sentences += len(batch)
+                generated_tokens += batch_tokens
+    seconds = time.perf_counter() - start_time
+    return {
+        "sentences": num_sentences,
+        "seconds": round(seconds, 3),
+        "sentences_per_second": round(num_sentences / seconds, 2),
+        "tokens_per_second": round(generated_tokens / seconds, 1),
+        "p50_batch_latency_ms": round(1000 * percentile(latencies, 50), 2),
+        "p99_batch_latency_ms": round(1000 * percentile(latencies, 99), 2),
+        "peak_rss_mb": peak_rss_mb(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--backend", required=True, choices=["ctranslate2", "fairseq", "hf"])
+    parser.add_argument("--ckpt-dir", help="engine.Model checkpoint directory (ctranslate2/fairseq)")
+    parser.add_argument("--hf-ckpt", help="HF checkpoint name or path (hf)")
+    parser.add_argument("--direction", default="en-indic", choices=sorted(DIRECTION_PAIRS))
+    parser.add_argument("--input", help="file with one sentence per line in the source language of every pair")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[1, 8, 32])
+    parser.add_argument("--beam-sizes", type=int, nargs="+", default=[1, 5])
+    parser.add_argument("--threads", type=int, nargs="+", default=[os.cpu_count() or 1])
+    parser.add_argument("--repeats", type=int, default=3, help="passes over the corpus per configuration")
+    parser.add_argument("--output", help="also write the JSON results to this file")
+    args = parser.parse_args()
+
+    if args.backend == "hf" and not args.hf_ckpt:
+        parser.error("--hf-ckpt is required for the hf backend")
+    if args.backend != "hf" and not args.ckpt_dir:
+        parser.error("--ckpt-dir is required for the ctranslate2 and fairseq backends")
+
+    input_sents = None
+    if args.input:
+        with open(args.input, "r", encoding="utf-8") as f:
+            input_sents = [line.strip() for line in f if line.strip()]
+    jobs = [
+        (input_sents or CORPUS[src_lang], src_lang, tgt_lang)
+        for src_lang, tgt_lang in DIRECTION_PAIRS[args.direction]
+    ]
+    results = []
+    for threads in args.threads:
+        load_start_time = time.perf_counter()
+        if args.backend == "hf":
+            translate = hf_translate_fn(args, threads)
+        else:
+            translate = engine_translate_fn(args, threads)
+        load_seconds = time.perf_counter() - load_start_time
+
+        # one untimed pass so that lazy initialization is not measured
+        run_config(translate, jobs, max(args.batch_sizes), min(args.beam_sizes), repeats=1)
+
+        for batch_size in args.batch_sizes:
+            for beam_size in args.beam_sizes:
+                record = {
+                    "backend": args.backend,
+                    "direction": args.direction,
+                    "threads": threads,
+                    "batch_size": batch_size,
+                    "beam_size": beam_size,
+                    "load_seconds": round(load_seconds, 2),
+                }
+                record.update(run_config(translate, jobs, batch_size, beam_size, args.repeats))
+                results.append(record)
+                print(json.dumps(record), file=sys.stderr)
+
+    print(json.dumps(results, indent=2))
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+
+
+if __name__ == "__main__":
+    main()
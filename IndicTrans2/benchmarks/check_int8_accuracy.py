@@ -0,0 +1,143 @@
+"""
+Checks the accuracy and speed of dynamic int8 CPU quantization of the HF IndicTrans2 models
+(`INDICTRANS_QUANTIZATION=int8` in `inference_server.py`).
+
+The same sentences are translated with the float32 model and its int8 copy. The float32
+outputs serve as references for the int8 outputs (chrF and exact-match rate), and the script
+exits with status 1 when chrF drops below `--min-chrf`. Both models are built the way the
+server builds them on CPU: the local `IndicTransForConditionalGeneration` with SDPA attention
+and the static KV cache, quantized with the server's `quantize_dynamic_int8`.
+
+Usage (from the IndicTrans2 directory):
+    python benchmarks/check_int8_accuracy.py --ckpt ai4bharat/indictrans2-en-indic-dist-200M --src-lang eng_Latn --tgt-lang hin_Deva
+    python benchmarks/check_int8_accuracy.py --ckpt ai4bharat/indictrans2-indic-en-dist-200M --src-lang hin_Deva --tgt-lang eng_Latn --input hi.txt
+"""
+
+import argparse
+import copy
+import io
+import json
+import os
+import sys
+import time
+from typing import Dict, List
+
+import torch
+from sacrebleu.metrics import CHRF
+from transformers import AutoTokenizer
+from IndicTransToolkit.processor import IndicProcessor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from huggingface_interface.modeling_indictrans import IndicTransForConditionalGeneration, quantize_dynamic_int8
+
+SENTENCES = {
+    "eng_Latn": [
+        "When I was young, I used to go to the park every day.",
+        "Your dog looks like it just lost an argument with a vacuum cleaner.",
+        "This cat has more attitude than a Bollywood villain.",
+        "He has many old books, which he inherited from his ancestors.",
+        "Mr. Sharma went to the market at 5 p.m. to buy a new sari.",
+        "We watched a new movie last week, which was very inspiring.",
+        "Who's a good boy? Definitely not this one.",
+        "Raj told me that he is going to his grandmother's house next month.",
+    ],
+    "hin_Deva": [
+        "जब मैं छोटा था, मैं हर रोज़ पार्क जाता था।",
+        "उसके पास बहुत सारी पुरानी किताबें हैं, जिन्हें उसने अपने दादा-परदादा से विरासत में पाया।",
+        "मुझे समझ में नहीं आ रहा कि मैं अपनी समस्या का समाधान कैसे ढूंढूं।",
+        "वह बहुत मेहनती और समझदार है, इसलिए उसे सभी अच्छे मार्क्स मिले।",
+        "हमने पिछले सप्ताह एक नई फिल्म देखी जो कि बहुत प्रेरणादायक थी।",
+        "राज ने मुझसे कहा कि वह अगले महीने अपनी नानी के घर जा रहा है।",
+    ],
+}
+
+
+def state_dict_megabytes(model: torch.nn.Module) -> float:
+    """Serialized size of the model weights, including packed int8 Linear weights."""
+    buffer = io.BytesIO()
+    torch.save(model.state_dict(), buffer)
+    return buffer.tell() / 2**20
+
+
+def translate(model, tokenizer, ip, sents: List[str], args) -> Dict[str, object]:
+    """Translates `sents` in batches and returns the outputs with throughput numbers."""
+    translations, generated_tokens, start_time = [], 0, time.perf_counter()
+    for start in range(0, len(sents), args.batch_size):
+        batch = ip.preprocess_batch(sents[start : start + args.batch_size], args.src_lang, args.tgt_lang)
+        inputs = tokenizer(
+            batch, truncation=True, padding="longest", return_tensors="pt", return_attention_mask=True
+        )
+        with torch.no_grad():
+            outputs = model.generate(
+                **inputs, use_cache=True, min_length=0, max_length=256, num_beams=args.num_beams
+            )
+        generated_tokens += int(outputs.ne(tokenizer.pad_token_id).sum())
+        with tokenizer.as_target_tokenizer():
+            decoded = tokenizer.batch_decode(
+                outputs.tolist(), skip_special_tokens=True, clean_up_tokenization_spaces=True
+            )
+        translations += ip.postprocess_batch(decoded, lang=args.tgt_lang)
+    seconds = time.perf_counter() - start_time
+    return {
+        "translations": translations,
+        "seconds": round(seconds, 3),
+        "tokens_per_second": round(generated_tokens / seconds, 1),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--ckpt", required=True, help="HF checkpoint name or path")
+    parser.add_argument("--src-lang", default="eng_Latn")
+    parser.add_argument("--tgt-lang", default="hin_Deva")
+    parser.add_argument("--input", help="file with one sentence per line (defaults: built-in sentences)")
+    parser.add_argument("--batch-size", type=int, default=4)
+    parser.add_argument("--num-beams", type=int, default=5)
+    parser.add_argument("--threads", type=int, help="torch intra-op threads")
+    parser.add_argument("--min-chrf", type=float, default=90.0, help="fail below this chrF of int8 vs float32")
+    args = parser.parse_args()
+
+    if args.threads:
+        torch.set_num_threads(args.threads)
+
+    if args.input:
+        with open(args.input, "r", encoding="utf-8") as f:
+            sents = [line.strip() for line in f if line.strip()]
+    else:
+        sents = SENTENCES[args.src_lang]
+
+    ip = IndicProcessor(inference=True)
+    tokenizer = AutoTokenizer.from_pretrained(args.ckpt, trust_remote_code=True)
+    model = IndicTransForConditionalGeneration.from_pretrained(
+        args.ckpt, torch_dtype=torch.float32, attn_implementation="sdpa"
+    )
+    model.eval()
+    model.enable_static_cache()
+    quantized_model = quantize_dynamic_int8(copy.deepcopy(model))
+
+    # warm up both models so that one-off allocation is not measured
+    translate(model, tokenizer, ip, sents[:1], args)
+    translate(quantized_model, tokenizer, ip, sents[:1], args)
+
+    float_run = translate(model, tokenizer, ip, sents, args)
+    int8_run = translate(quantized_model, tokenizer, ip, sents, args)
+
+    references = float_run.pop("translations")
+    hypotheses = int8_run.pop("translations")
+    chrf = CHRF().corpus_score(hypotheses, [references]).score
+    results = {
+        "sentences": len(sents),
+        "chrf_int8_vs_float32": round(chrf, 2),
+        "exact_match_pct": round(100 * sum(h == r for h, r in zip(hypotheses, references)) / len(sents), 1),
+        "float32": {**float_run, "weights_mb": round(state_dict_megabytes(model), 1)},
+        "int8": {**int8_run, "weights_mb": round(state_dict_megabytes(quantized_model), 1)},
+    }
+    print(json.dumps(results, indent=2))
+
+    if chrf < args.min_chrf:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
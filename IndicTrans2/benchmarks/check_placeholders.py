@@ -0,0 +1,63 @@
+"""
+Regression check for placeholder wrapping (`inference/normalize_regex_inference.py`).
+
+Every case lists the entities that must be wrapped, in order of appearance, and the check fails
+with status 1 if `normalize` wraps different spans. Placeholder numbers are ignored; the spans
+depend on pattern precedence, e.g. the URL pattern claims "200.50" in "1,200.50" before the
+numeral pattern sees the full number.
+
+Usage (from the IndicTrans2 directory):
+    python benchmarks/check_placeholders.py
+"""
+
+import argparse
+import json
+import os
+import sys
+from typing import List, Tuple
+
+import regex as re
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from inference.normalize_regex_inference import normalize
+
+CASES: List[Tuple[str, List[str]]] = [
+    ("Price is 1,200.50 today", ["200.50"]),
+    ("A. B. Sharma paid 1,00,000 rs", ["1,00,000"]),
+    (
+        "Visit www.example.com/page or mail a.b@c.com at 10:30 on 12/05/2023",
+        ["www.example.com/page", "a.b@c.com", "10:30", "12/05/2023"],
+    ),
+    ("#PetRoast @fluffy 50% - 60% off", ["#PetRoast", "@fluffy", "50% - 60%"]),
+    ("Call 98765-43210 or 98765-43210 again", ["98765-43210", "98765-43210"]),
+    ("https://x.io/a/ and 3:45:10 pm, 1.5 - 2.5%", ["https://x.io/a", "3:45:10", "1.5 - 2.5%"]),
+    ("upi id abc@okaxis; tweet #one#two", ["abc@okaxis", "#one", "#two"]),
+    ("u.s.a and e.g. version 2.5", []),
+]
+PLACEHOLDER_PATTERN = re.compile(r"<ID\d+>")
+
+
+def wrapped_entities(text: str) -> List[str]:
+    """Returns the entities `normalize` wrapped in `text`, in order of appearance."""
+    normalized_text, placeholder_entity_map = normalize(text)
+    return [placeholder_entity_map[m.group()] for m in PLACEHOLDER_PATTERN.finditer(normalized_text)]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.parse_args()
+
+    failures = []
+    for text, expected in CASES:
+        entities = wrapped_entities(text)
+        if entities != expected:
+            failures.append({"text": text, "expected": expected, "wrapped": entities})
+
+    print(json.dumps({"cases": len(CASES), "failures": failures}, indent=2, ensure_ascii=False))
+    if failures:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,12 +1,18 @@
+import os
 import sys
 import torch
-from transformers import AutoModelForSeq2SeqLM, AutoTokenizer, BitsAndBytesConfig
+from transformers import AutoTokenizer, BitsAndBytesConfig
 from transformers.utils import is_flash_attn_2_available, is_flash_attn_greater_or_equal_2_10
 from IndicTransToolkit.processor import IndicProcessor
 from mosestokenizer import MosesSentenceSplitter
 from nltk import sent_tokenize
 from indicnlp.tokenize.sentence_tokenize import sentence_split, DELIM_PAT_NO_DANDA
 
+# the weights are loaded into the local modeling class, which supports SDPA, rather than the
+# modeling code published with the checkpoints
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from huggingface_interface.modeling_indictrans import IndicTransForConditionalGeneration, quantize_dynamic_int8
+
 
 en_indic_ckpt_dir = "ai4bharat/indictrans2-en-indic-1B"  # ai4bharat/indictrans2-en-indic-dist-200M
 indic_en_ckpt_dir = "ai4bharat/indictrans2-indic-en-1B"  # ai4bharat/indictrans2-indic-en-dist-200M
@@ -21,7 +27,12 @@ if len(sys.argv) > 1:
     attn_implementation = sys.argv[2]
 else:
     quantization = ""
-    attn_implementation = "eager"
+    # SDPA runs fused attention kernels on CPU
+    attn_implementation = "sdpa" if DEVICE == "cpu" else "eager"
+
+if quantization == "int8-dynamic":
+    # the dynamically quantized int8 kernels only run on CPU
+    DEVICE = "cpu"
 
 
 # FLORES language code mapping to 2 letter ISO language code for compatibility
@@ -103,15 +114,17 @@ def initialize_model_and_tokenizer(ckpt_dir, quantization, attn_implementation):
             attn_implementation = "eager"
 
     tokenizer = AutoTokenizer.from_pretrained(ckpt_dir, trust_remote_code=True)
-    model = AutoModelForSeq2SeqLM.from_pretrained(
+    model = IndicTransForConditionalGeneration.from_pretrained(
         ckpt_dir,
-        trust_remote_code=True,
         attn_implementation=attn_implementation,
         low_cpu_mem_usage=True,
         quantization_config=qconfig,
     )
 
-    if qconfig == None:
+    if quantization == "int8-dynamic":
+        # CPU only: int8 weights and int8 matmuls for the Linear layers, no CUDA required
+        model = quantize_dynamic_int8(model)
+    elif qconfig == None:
         model = model.to(DEVICE)
         model.half()
 
@@ -16,6 +16,7 @@
 
 
 import math
+from contextvars import ContextVar
 from typing import List, Optional, Tuple, Union
 
 import torch
@@ -109,6 +110,118 @@ def create_position_ids_from_input_ids(
     return incremental_indices.long() + padding_idx
 
 
+# Number of positions preallocated for the decoder self-attention caches of the `generate` call
+# running in this thread or task, or None when caches grow with `torch.cat`; set by
+# `IndicTransForConditionalGeneration.generate` when the static cache mode is enabled.
+_static_cache_length: ContextVar[Optional[int]] = ContextVar("indictrans_static_cache_length", default=None)
+
+
+def static_cache_capacity(cache: torch.Tensor) -> int:
+    """
+    Returns the number of positions available in the buffer behind a
+    `(batch_size, num_heads, length, head_dim)` self-attention cache. Caches created with
+    `append_to_static_cache` are views into a larger preallocated buffer; any other tensor
+    has no spare capacity.
+    """
+    length, head_dim = cache.shape[2:]
+    if cache.stride(3) != 1 or cache.stride(2) != head_dim:
+        return length
+    return max(cache.stride(1) // head_dim, length)
+
+
+def append_to_static_cache(
+    cache: Optional[torch.Tensor], states: torch.Tensor, max_length: int
+) -> torch.Tensor:
+    """
+    Appends `states` along the sequence dimension of a self-attention cache without
+    reallocating it at every step.
+
+    The cache is a view into a `(batch_size, num_heads, max_length, head_dim)` buffer covering
+    the current length; new states are written in place after it and a view covering the
+    extended length is returned. The view merges its batch and head dimensions without a copy,
+    so attention can consume it directly. A new buffer is allocated only when there is no cache
+    yet or it is full, in which case its capacity is doubled.
+    """
+    bsz, num_heads, new_states_length, head_dim = states.shape
+    length = 0 if cache is None else cache.size(2)
+    new_length = length + new_states_length
+
+    if cache is None or static_cache_capacity(cache) < new_length:
+        buffer = states.new_empty(bsz, num_heads, max(max_length, 2 * length, new_length), head_dim)
+        if cache is not None:
+            buffer[:, :, :length] = cache
+        cache = buffer[:, :, :length]
+
+    extended_cache = cache.as_strided(
+        (bsz, num_heads, new_length, head_dim), cache.stride(), cache.storage_offset()
+    )
+    extended_cache[:, :, length:new_length] = states
+    return extended_cache
+
+
+def _reorder_cache_state(state: torch.Tensor, beam_idx: torch.Tensor) -> torch.Tensor:
+    """Reorders a cache along the batch dimension, in place for static caches to keep their buffer."""
+    if static_cache_capacity(state) > state.size(2):
+        state.copy_(state.index_select(0, beam_idx))
+        return state
+    return state.index_select(0, beam_idx)
+
+
+def compile_encoder_decoder_layers(model: nn.Module, **compile_kwargs) -> nn.Module:
+    """
+    Compiles the forward of every encoder and decoder layer with `torch.compile`, so that the
+    attention, layer norm and feed-forward ops of a layer run as fused kernels while `generate`
+    keeps its Python decoding loop. Works for any IndicTrans model exposing
+    `model.encoder.layers` and `model.decoder.layers`. Compilation happens on the first calls
+    with each new input shape, so callers should warm the model up before serving.
+    """
+    base_model = getattr(model, "model", model)
+    for layers in (base_model.encoder.layers, base_model.decoder.layers):
+        for layer in layers:
+            layer.forward = torch.compile(layer.forward, **compile_kwargs)
+    return model
+
+
+def quantize_dynamic_int8(model: nn.Module) -> nn.Module:
+    """
+    Returns a copy of a CPU model with its Linear layers quantized to int8 with dynamic
+    activation quantization. Weights are stored in int8 and matmuls run on int8 kernels,
+    embeddings and layer norms stay in float32. The quantized kernels only run on CPU.
+    """
+    return torch.ao.quantization.quantize_dynamic(model, {nn.Linear}, dtype=torch.qint8)
+
+
+def target_tag_positions(attention_mask: torch.Tensor) -> torch.Tensor:
+    """
+    Returns the position of the target language tag in every row. Inputs are laid out as
+    `src_lang tgt_lang tokens... </s>`, so the tag follows the first non-padding token
+    (this holds for both left and right padding).
+    """
+    return attention_mask.long().argmax(dim=1) + 1
+
+
+def find_shared_source_groups(
+    input_ids: torch.Tensor, attention_mask: torch.Tensor
+) -> List[List[int]]:
+    """
+    Groups the rows of a batch that encode the same source and only differ in their target
+    language tag, e.g. one sentence requested in several target languages.
+
+    Returns:
+        `List[List[int]]`: row indices per group, in order of first occurrence.
+    """
+    tag_positions = target_tag_positions(attention_mask).tolist()
+    groups = {}
+    for row, (ids, mask, tag_position) in enumerate(
+        zip(input_ids.tolist(), attention_mask.tolist(), tag_positions)
+    ):
+        tokens = [token for token, keep in zip(ids, mask) if keep]
+        start = tag_position - mask.index(1)
+        source_key = tuple(tokens[:start] + tokens[start + 1 :])
+        groups.setdefault(source_key, []).append(row)
+    return list(groups.values())
+
+
 # Copied from transformers.models.m2m_100.modeling_m2m_100.M2M100SinusoidalPositionalEmbedding->IndicTrans
 class IndicTransSinusoidalPositionalEmbedding(nn.Module):
     """This module produces sinusoidal positional embeddings of any length."""
@@ -261,6 +374,34 @@ class IndicTransAttention(nn.Module):
             .contiguous()
         )
 
+    def _use_static_cache(self) -> bool:
+        return self.is_decoder and not self.training and _static_cache_length.get() is not None
+
+    def _update_self_attention_cache(
+        self,
+        past_key_value: Optional[Tuple[torch.Tensor]],
+        key_states: torch.Tensor,
+        value_states: torch.Tensor,
+    ) -> Tuple[torch.Tensor, torch.Tensor]:
+        """
+        Appends the current key/value states to the decoder self-attention cache. In static
+        cache mode they are written in place into buffers preallocated for the length of the
+        running `generate` call instead of concatenating at every step.
+        """
+        if self._use_static_cache():
+            max_length = _static_cache_length.get()
+            past_key_states, past_value_states = past_key_value or (None, None)
+            return (
+                append_to_static_cache(past_key_states, key_states, max_length),
+                append_to_static_cache(past_value_states, value_states, max_length),
+            )
+        if past_key_value is None:
+            return key_states, value_states
+        return (
+            torch.cat([past_key_value[0], key_states], dim=2),
+            torch.cat([past_key_value[1], value_states], dim=2),
+        )
+
     def forward(
         self,
         hidden_states: torch.Tensor,
@@ -296,12 +437,13 @@ class IndicTransAttention(nn.Module):
             # cross_attentions
             key_states = self._shape(self.k_proj(key_value_states), -1, bsz)
             value_states = self._shape(self.v_proj(key_value_states), -1, bsz)
-        elif past_key_value is not None:
+        elif past_key_value is not None or self._use_static_cache():
             # reuse k, v, self_attention
             key_states = self._shape(self.k_proj(hidden_states), -1, bsz)
             value_states = self._shape(self.v_proj(hidden_states), -1, bsz)
-            key_states = torch.cat([past_key_value[0], key_states], dim=2)
-            value_states = torch.cat([past_key_value[1], value_states], dim=2)
+            key_states, value_states = self._update_self_attention_cache(
+                past_key_value, key_states, value_states
+            )
         else:
             # self_attention
             key_states = self._shape(self.k_proj(hidden_states), -1, bsz)
@@ -319,8 +461,10 @@ class IndicTransAttention(nn.Module):
 
         proj_shape = (bsz * self.num_heads, -1, self.head_dim)
         query_states = self._shape(query_states, tgt_len, bsz).view(*proj_shape)
-        key_states = key_states.reshape(*proj_shape)
-        value_states = value_states.reshape(*proj_shape)
+        # `view` rather than `reshape`: static caches merge their batch and head dimensions
+        # in place, so attention reads the preallocated buffers without copying them
+        key_states = key_states.view(*proj_shape)
+        value_states = value_states.view(*proj_shape)
 
         src_len = key_states.size(1)
         attn_weights = torch.bmm(query_states, key_states.transpose(1, 2))
@@ -660,12 +804,13 @@ class IndicTransSdpaAttention(IndicTransAttention):
             # cross_attentions
             key_states = self._shape(self.k_proj(key_value_states), -1, bsz)
             value_states = self._shape(self.v_proj(key_value_states), -1, bsz)
-        elif past_key_value is not None:
+        elif past_key_value is not None or self._use_static_cache():
             # reuse k, v, self_attention
             key_states = self._shape(self.k_proj(hidden_states), -1, bsz)
             value_states = self._shape(self.v_proj(hidden_states), -1, bsz)
-            key_states = torch.cat([past_key_value[0], key_states], dim=2)
-            value_states = torch.cat([past_key_value[1], value_states], dim=2)
+            key_states, value_states = self._update_self_attention_cache(
+                past_key_value, key_states, value_states
+            )
         else:
             # self_attention
             key_states = self._shape(self.k_proj(hidden_states), -1, bsz)
@@ -685,6 +830,7 @@ class IndicTransSdpaAttention(IndicTransAttention):
 
         # NOTE: SDPA with memory-efficient backend is currently (torch==2.1.2) bugged when using non-contiguous inputs and a custom attn_mask,
         # but we are fine here as `_shape` do call `.contiguous()`. Reference: https://github.com/pytorch/pytorch/issues/112577
+        # Static caches are non-contiguous views, which is why the server only enables them on CPU.
         attn_output = F.scaled_dot_product_attention(
             query_states,
             key_states,
@@ -948,6 +1094,8 @@ class IndicTransPreTrainedModel(PreTrainedModel):
     base_model_prefix = "model"
     supports_gradient_checkpointing = True
     _no_split_modules = ["IndicTransAttention"]
+    _supports_flash_attn_2 = True
+    _supports_sdpa = True
 
     def _init_weights(self, module):
         std = self.config.init_std
@@ -1656,6 +1804,9 @@ class IndicTransForConditionalGeneration(IndicTransPreTrainedModel):
         if config.share_decoder_input_output_embed:
             self.lm_head.weight = self.model.decoder.embed_tokens.weight
 
+        # see `enable_static_cache`
+        self.use_static_kv_cache = False
+
         self.post_init()
 
     def tie_weights(self):
@@ -1789,13 +1940,46 @@ class IndicTransForConditionalGeneration(IndicTransPreTrainedModel):
             "use_cache": use_cache,  # change this to avoid caching (presumably for debugging)
         }
 
+    def enable_static_cache(self):
+        """
+        Makes `generate` preallocate the decoder self-attention key/value caches for the
+        `max_length` of each call and write new states in place, instead of growing them with
+        `torch.cat` at every decoding step. Supported by the eager and SDPA attention
+        implementations; only used in eval mode.
+        """
+        self.use_static_kv_cache = True
+
+    def disable_static_cache(self):
+        self.use_static_kv_cache = False
+
+    def generate(self, *args, **kwargs):
+        """
+        Runs `GenerationMixin.generate`. With the static cache mode enabled, the decoder
+        self-attention caches of this call are sized for its `max_length` (or `max_new_tokens`
+        plus the decoder start token). The size is scoped to the call, so concurrent calls on a
+        shared model each get their own buffers.
+        """
+        if not self.use_static_kv_cache or self.training:
+            return super().generate(*args, **kwargs)
+
+        generation_config = kwargs.get("generation_config") or self.generation_config
+        if kwargs.get("max_new_tokens") is not None:
+            max_length = kwargs["max_new_tokens"] + 1
+        else:
+            max_length = kwargs.get("max_length") or generation_config.max_length
+        token = _static_cache_length.set(max_length)
+        try:
+            return super().generate(*args, **kwargs)
+        finally:
+            _static_cache_length.reset(token)
+
     @staticmethod
     def _reorder_cache(past_key_values, beam_idx):
         reordered_past = ()
         for layer_past in past_key_values:
             reordered_past += (
                 tuple(
-                    past_state.index_select(0, beam_idx) for past_state in layer_past
+                    _reorder_cache_state(past_state, beam_idx) for past_state in layer_past
                 ),
             )
         return reordered_past
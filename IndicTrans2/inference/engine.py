@@ -1,7 +1,13 @@
+import atexit
 import hashlib
+import multiprocessing
 import os
+import queue
+import threading
 import uuid
-from typing import List, Tuple, Union, Dict
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple, Union
 
 import regex as re
 import sentencepiece as spm
@@ -16,13 +22,145 @@ from tqdm import tqdm
 
 from .flores_codes_map_indic import flores_codes, iso_to_flores
 from .normalize_punctuation import punc_norm
-from .normalize_regex_inference import EMAIL_PATTERN, normalize
+from .normalize_regex_inference import EMAIL_PATTERN, normalize, restore_placeholders
+from .sentence_cache import SentenceCache
+from .stage_timers import StageTimers
+
+
+# Sentence-final punctuation that may trigger a split in Moses or NLTK. Paragraphs without any
+# of these before their trailing punctuation are a single sentence and skip both splitters.
+SENTENCE_END_CHARS = ".!?"
+TRAILING_SENTENCE_END_CHARS = SENTENCE_END_CHARS + "\"')]}»” \t"
+
+# The IndicTrans2 models accept at most 256 source positions; the CT2 translator is run with a
+# shorter input limit. Longer inputs are split into chunks rather than silently truncated.
+MAX_SEQ_LEN = 256
+CT2_MAX_INPUT_LENGTH = 160
+# Language tags plus the end-of-sentence token added to every model input.
+NUM_SPECIAL_TOKENS = 3
+
+
+class DecodingProfile(NamedTuple):
+    """
+    Decoding settings selectable per request. The decoding budget grows with the input:
+    `max_decoding_length = min(MAX_SEQ_LEN, length_ratio * longest input + length_margin)`.
+    """
+
+    beam_size: int
+    length_ratio: float
+    length_margin: int
+
+
+DECODING_PROFILES = {
+    "fast": DecodingProfile(beam_size=1, length_ratio=2.0, length_margin=10),
+    "balanced": DecodingProfile(beam_size=2, length_ratio=2.5, length_margin=10),
+    "quality": DecodingProfile(beam_size=5, length_ratio=3.0, length_margin=16),
+}
+DEFAULT_DECODING_PROFILE = "quality"
+
+# stages timed by `Model.timers`, in pipeline order; all but "postprocess" (target language) are
+# timed per source language
+PIPELINE_STAGES = ("split", "punc_norm", "placeholders", "tokenize", "spm", "decode", "postprocess")
+
+# SPM tokens after which a long sentence is preferably split into chunks.
+CHUNK_BOUNDARY_TOKENS = {",", ";", ":", ".", "?", "!", "।", "॥", "۔", "،", ")"}
+
+
+class MosesSentenceSplitterPool:
+    """
+    Pool of persistent Moses sentence splitter processes for a single language.
+
+    `MosesSentenceSplitter` wraps a Perl subprocess, so creating one per call is expensive.
+    The pool lazily starts up to `size` splitters and reuses them across calls; each
+    splitter is used by one thread at a time.
+    """
+
+    def __init__(self, lang: str, size: int = 2):
+        """
+        Initialize the splitter pool.
+
+        Args:
+            lang (str): iso language code understood by Moses.
+            size (int, optional): maximum number of splitter processes (defaults: 2).
+        """
+        self.lang = lang
+        self.size = size
+        self._splitters = queue.LifoQueue()
+        self._num_created = 0
+        self._lock = threading.Lock()
+
+    def _acquire(self) -> MosesSentenceSplitter:
+        try:
+            return self._splitters.get_nowait()
+        except queue.Empty:
+            pass
+        with self._lock:
+            if self._num_created < self.size:
+                self._num_created += 1
+                return MosesSentenceSplitter(self.lang)
+        return self._splitters.get()
+
+    def split(self, paragraph: str) -> List[str]:
+        """Splits a single paragraph into sentences with a pooled splitter."""
+        splitter = self._acquire()
+        try:
+            return splitter([paragraph])
+        finally:
+            self._splitters.put(splitter)
+
+    def close(self) -> None:
+        """Terminates all idle splitter processes."""
+        while True:
+            try:
+                self._splitters.get_nowait().close()
+            except queue.Empty:
+                break
+
+
+_moses_splitter_pools: Dict[str, MosesSentenceSplitterPool] = {}
+_moses_splitter_pools_lock = threading.Lock()
+
+
+def get_moses_splitter_pool(lang: str) -> MosesSentenceSplitterPool:
+    """
+    Returns the process-wide Moses splitter pool for a language, creating it on first use.
+
+    Args:
+        lang (str): iso language code understood by Moses.
+
+    Returns:
+        MosesSentenceSplitterPool: the shared pool.
+    """
+    with _moses_splitter_pools_lock:
+        if lang not in _moses_splitter_pools:
+            pool = MosesSentenceSplitterPool(lang)
+            atexit.register(pool.close)
+            _moses_splitter_pools[lang] = pool
+        return _moses_splitter_pools[lang]
+
+
+def is_single_sentence(paragraph: str) -> bool:
+    """
+    Checks whether a paragraph trivially contains a single sentence, i.e. it has no line breaks
+    and no sentence-final punctuation except (optionally) at its very end.
+
+    Args:
+        paragraph (str): input text paragraph.
+
+    Returns:
+        bool: True if the paragraph does not need a sentence splitter.
+    """
+    if "\n" in paragraph or "\r" in paragraph:
+        return False
+    body = paragraph.strip().rstrip(TRAILING_SENTENCE_END_CHARS)
+    return not any(char in body for char in SENTENCE_END_CHARS)
 
 
 def split_sentences(paragraph: str, lang: str) -> List[str]:
     """
     Splits the input text paragraph into sentences. It uses `moses` for English and
-    `indic-nlp` for Indic languages.
+    `indic-nlp` for Indic languages. English paragraphs without inner sentence boundaries
+    take a fast path that skips both splitters.
 
     Args:
         paragraph (str): input text paragraph.
@@ -32,8 +170,10 @@ def split_sentences(paragraph: str, lang: str) -> List[str]:
         List[str] -> list of sentences.
     """
     if lang == "eng_Latn":
-        with MosesSentenceSplitter(flores_codes[lang]) as splitter:
-            sents_moses = splitter([paragraph])
+        if is_single_sentence(paragraph):
+            sent = " ".join(paragraph.split())
+            return [sent.replace("\xad", "")] if sent else []
+        sents_moses = get_moses_splitter_pool(flores_codes[lang]).split(paragraph)
         sents_nltk = sent_tokenize(paragraph)
         if len(sents_nltk) < len(sents_moses):
             sents = sents_nltk
@@ -44,78 +184,290 @@ def split_sentences(paragraph: str, lang: str) -> List[str]:
         return sentence_split(paragraph, lang=flores_codes[lang], delim_pat=DELIM_PAT_NO_DANDA)
 
 
-def add_token(sent: str, src_lang: str, tgt_lang: str, delimiter: str = " ") -> str:
+def split_long_tokens(tokens: List[str], max_len: int) -> List[List[str]]:
     """
-    Add special tokens indicating source and target language to the start of the input sentence.
-    The resulting string will have the format: "`{src_lang} {tgt_lang} {input_sentence}`".
+    Splits a sequence of SPM tokens into chunks of at most `max_len` tokens.
+
+    Chunks end at the last clause or sentence boundary (a punctuation token followed by a word
+    start) in the second half of the budget, falling back to the last word start and only then
+    to a hard cut, so that each chunk can be translated on its own. No chunk is empty.
 
     Args:
-        sent (str): input sentence to be translated.
-        src_lang (str): flores lang code of the input sentence.
-        tgt_lang (str): flores lang code in which the input sentence will be translated.
-        delimiter (str): separator to add between language tags and input sentence (default: " ").
+        tokens (List[str]): SPM tokens of a sentence.
+        max_len (int): maximum number of tokens per chunk.
 
     Returns:
-        str: input sentence with the special tokens added to the start.
+        List[List[str]]: the chunks, which concatenate back to `tokens`.
+    """
+    chunks = []
+    start = 0
+    while len(tokens) - start > max_len:
+        end = start + max_len
+        cut = None
+        for i in range(end, start + max_len // 2, -1):
+            if tokens[i].startswith("▁") and tokens[i - 1].lstrip("▁") in CHUNK_BOUNDARY_TOKENS:
+                cut = i
+                break
+        if cut is None:
+            for i in range(end, start, -1):
+                if tokens[i].startswith("▁"):
+                    cut = i
+                    break
+        if cut is None:
+            cut = end
+        chunks.append(tokens[start:cut])
+        start = cut
+    if start < len(tokens):
+        chunks.append(tokens[start:])
+    return chunks
+
+
+class LanguageTools(NamedTuple):
+    """Per-language text processing settings and tool instances."""
+
+    iso_lang: str
+    script_code: str
+    transliterate: bool
+    normalizer: Optional[indic_normalize.BaseNormalizer]
+
+
+# sample text pushed through every processing stage by `TextProcessor.warm_up`
+WARM_UP_TEXT = "Hello 123, mail a@b.com."
+
+
+class TextProcessor:
+    """
+    Text pre/post-processing (normalization, tokenization, transliteration and detokenization)
+    shared by `Model` and the worker processes of its optional processing pool.
     """
-    return src_lang + delimiter + tgt_lang + delimiter + sent
 
+    def __init__(self):
+        """
+        Initialize the text processing tools.
+        """
+        self.en_tok = MosesTokenizer(lang="en")
+        self.en_normalizer = MosesPunctNormalizer()
+        self.en_detok = MosesDetokenizer(lang="en")
+        self.xliterator = unicode_transliterate.UnicodeIndicTransliterator()
+        self.normalizer_factory = indic_normalize.IndicNormalizerFactory()
+        self.language_tools: Dict[str, LanguageTools] = {}
+        # stage timing is off in processing pool workers, `Model` replaces the registry
+        self.timers = StageTimers(enabled=False)
 
-def apply_lang_tags(sents: List[str], src_lang: str, tgt_lang: str) -> List[str]:
-    """
-    Add special tokens indicating source and target language to the start of the each input sentence.
-    Each resulting input sentence will have the format: "`{src_lang} {tgt_lang} {input_sentence}`".
+    def get_language_tools(self, lang: str) -> LanguageTools:
+        """
+        Returns the tools for a language, creating them on first use.
 
-    Args:
-        sent (str): input sentence to be translated.
-        src_lang (str): flores lang code of the input sentence.
-        tgt_lang (str): flores lang code in which the input sentence will be translated.
+        Args:
+            lang (str): flores language code.
 
-    Returns:
-        List[str]: list of input sentences with the special tokens added to the start.
-    """
-    tagged_sents = []
-    for sent in sents:
-        tagged_sent = add_token(sent.strip(), src_lang, tgt_lang)
-        tagged_sents.append(tagged_sent)
-    return tagged_sents
+        Returns:
+            LanguageTools: the cached tools of the language.
+        """
+        tools = self.language_tools.get(lang)
+        if tools is None:
+            iso_lang = flores_codes[lang]
+            script_code = lang.split("_")[1]
+            tools = LanguageTools(
+                iso_lang=iso_lang,
+                script_code=script_code,
+                transliterate=script_code not in ["Arab", "Aran", "Olck", "Mtei", "Latn"],
+                # languages mapped to "en" (e.g. kha_Latn) are tokenized with Moses, indicnlp has no
+                # normalizer for them
+                normalizer=None if iso_lang == "en" else self.normalizer_factory.get_normalizer(iso_lang),
+            )
+            self.language_tools[lang] = tools
+        return tools
 
+    def warm_up(self, langs: Optional[List[str]] = None) -> None:
+        """
+        Builds the tools of the given languages and runs a sample sentence through preprocessing and
+        postprocessing, so that lazily initialized state is not created while serving requests.
 
-def truncate_long_sentences(
-    sents: List[str], placeholder_entity_map_sents: List[Dict]
-) -> Tuple[List[str], List[Dict]]:
-    """
-    Truncates the sentences that exceed the maximum sequence length.
-    The maximum sequence for the IndicTrans2 model is limited to 256 tokens.
+        Args:
+            langs (List[str], optional): flores language codes (defaults: all supported languages).
+        """
+        for lang in langs or list(flores_codes):
+            self.get_language_tools(lang)
+            preprocessed_sents, placeholder_entity_map_sents = self.preprocess([WARM_UP_TEXT], lang)
+            self.postprocess(preprocessed_sents, placeholder_entity_map_sents, lang)
 
-    Args:
-        sents (List[str]): list of input sentences to truncate.
+    def preprocess_sent(
+        self,
+        sent: str,
+        normalizer: Union[MosesPunctNormalizer, indic_normalize.IndicNormalizerFactory],
+        lang: str,
+    ) -> Tuple[str, Dict]:
+        """
+        Preprocess an input text sentence by normalizing, tokenization, and possibly transliterating it.
 
-    Returns:
-        Tuple[List[str], List[Dict]]: tuple containing the list of sentences with truncation applied and the updated placeholder entity maps.
-    """
-    MAX_SEQ_LEN = 256
-    new_sents = []
-    placeholders = []
-
-    for j, sent in enumerate(sents):
-        words = sent.split()
-        num_words = len(words)
-        if num_words > MAX_SEQ_LEN:
-            sents = []
-            i = 0
-            while i <= len(words):
-                sents.append(" ".join(words[i : i + MAX_SEQ_LEN]))
-                i += MAX_SEQ_LEN
-            placeholders.extend([placeholder_entity_map_sents[j]] * (len(sents)))
-            new_sents.extend(sents)
+        Args:
+            sent (str): input text sentence to preprocess.
+            normalizer (Union[MosesPunctNormalizer, indic_normalize.IndicNormalizerFactory]): an object that performs normalization on the text.
+            lang (str): flores language code of the input text sentence.
+
+        Returns:
+            Tuple[str, Dict]: A tuple containing the preprocessed input text sentence and a corresponding dictionary
+            mapping placeholders to their original values.
+        """
+        sent = punc_norm(sent, self.get_language_tools(lang).iso_lang)
+        sent, placeholder_entity_map = normalize(sent)
+        return self.tokenize_sent(sent, normalizer, lang), placeholder_entity_map
+
+    def tokenize_sent(
+        self,
+        sent: str,
+        normalizer: Union[MosesPunctNormalizer, indic_normalize.IndicNormalizerFactory],
+        lang: str,
+    ) -> str:
+        """
+        Normalizes, tokenizes and possibly transliterates a sentence that is already punctuation-normalized
+        and placeholdered.
+
+        Args:
+            sent (str): input text sentence.
+            normalizer (Union[MosesPunctNormalizer, indic_normalize.IndicNormalizerFactory]): an object that performs normalization on the text.
+            lang (str): flores language code of the input text sentence.
+
+        Returns:
+            str: the tokenized sentence.
+        """
+        tools = self.get_language_tools(lang)
+        iso_lang = tools.iso_lang
+
+        if iso_lang == "en":
+            processed_sent = " ".join(
+                self.en_tok.tokenize(self.en_normalizer.normalize(sent.strip()), escape=False)
+            )
+        elif tools.transliterate:
+            # transliterates from the any specific language to devanagari
+            # which is why we specify lang2_code as "hi".
+            processed_sent = self.xliterator.transliterate(
+                " ".join(
+                    indic_tokenize.trivial_tokenize(normalizer.normalize(sent.strip()), iso_lang)
+                ),
+                iso_lang,
+                "hi",
+            ).replace(" ् ", "्")
         else:
-            placeholders.append(placeholder_entity_map_sents[j])
-            new_sents.append(sent)
-    return new_sents, placeholders
+            # we only need to transliterate for joint training
+            processed_sent = " ".join(
+                indic_tokenize.trivial_tokenize(normalizer.normalize(sent.strip()), iso_lang)
+            )
+
+        return processed_sent
+
+    def preprocess(self, sents: List[str], lang: str):
+        """
+        Preprocess an array of sentences by normalizing, tokenization, and possibly transliterating it.
+
+        Args:
+            batch (List[str]): input list of sentences to preprocess.
+            lang (str): flores language code of the input text sentences.
+
+        Returns:
+            Tuple[List[str], List[Dict]]: a tuple of list of preprocessed input text sentences and also a corresponding list of dictionary
+                mapping placeholders to their original values.
+        """
+        tools = self.get_language_tools(lang)
+
+        # each step runs over the whole batch so that it can be timed as one stage
+        with self.timers.time("punc_norm", lang, len(sents)):
+            sents = [punc_norm(sent, tools.iso_lang) for sent in sents]
+        with self.timers.time("placeholders", lang, len(sents)):
+            placeholdered_sents = [normalize(sent) for sent in sents]
+        with self.timers.time("tokenize", lang, len(sents)):
+            processed_sents = [
+                self.tokenize_sent(sent, tools.normalizer, lang) for sent, _ in placeholdered_sents
+            ]
 
+        return processed_sents, [placeholder_entity_map for _, placeholder_entity_map in placeholdered_sents]
 
-class Model:
+    def postprocess(
+        self,
+        sents: List[str],
+        placeholder_entity_map: List[Dict],
+        lang: str,
+        common_lang: str = "hin_Deva",
+    ) -> List[str]:
+        """
+        Postprocesses a batch of input sentences after the translation generations.
+
+        Args:
+            sents (List[str]): batch of translated sentences to postprocess.
+            placeholder_entity_map (List[Dict]): dictionary mapping placeholders to the original entity values.
+            lang (str): flores language code of the input sentences.
+            common_lang (str, optional): flores language code of the transliterated language (defaults: hin_Deva).
+
+        Returns:
+            List[str]: postprocessed batch of input sentences.
+        """
+        with self.timers.time("postprocess", lang, len(sents)):
+            lang_code, script_code = lang.split("_")
+            # SPM decode
+            for i in range(len(sents)):
+                # sent_tokens = sents[i].split(" ")
+                # sents[i] = self.sp_tgt.decode(sent_tokens)
+
+                sents[i] = sents[i].replace(" ", "").replace("▁", " ").strip()
+
+                # Fixes for Perso-Arabic scripts
+                # TODO: Move these normalizations inside indic-nlp-library
+                if script_code in {"Arab", "Aran"}:
+                    # UrduHack adds space before punctuations. Since the model was trained without fixing this issue, let's fix it now
+                    sents[i] = sents[i].replace(" ؟", "؟").replace(" ۔", "۔").replace(" ،", "،")
+                    # Kashmiri bugfix for palatalization: https://github.com/AI4Bharat/IndicTrans2/issues/11
+                    sents[i] = sents[i].replace("ٮ۪", "ؠ")
+
+            assert len(sents) == len(placeholder_entity_map)
+
+            for i in range(0, len(sents)):
+                sents[i] = restore_placeholders(sents[i], placeholder_entity_map[i])
+
+            # Detokenize and transliterate to native scripts if applicable
+            postprocessed_sents = []
+
+            if lang == "eng_Latn":
+                for sent in sents:
+                    postprocessed_sents.append(self.en_detok.detokenize(sent.split(" ")))
+            else:
+                for sent in sents:
+                    outstr = indic_detokenize.trivial_detokenize(
+                        self.xliterator.transliterate(
+                            sent, flores_codes[common_lang], flores_codes[lang]
+                        ),
+                        flores_codes[lang],
+                    )
+
+                    # Oriya bug: indic-nlp-library produces ଯ଼ instead of ୟ when converting from Devanagari to Odia
+                    # TODO: Find out what's the issue with unicode transliterator for Oriya and fix it
+                    if lang_code == "ory":
+                        outstr = outstr.replace("ଯ଼", 'ୟ')
+
+                    postprocessed_sents.append(outstr)
+
+            return postprocessed_sents
+
+
+# text processor of a processing pool worker, created once per worker process
+_worker_text_processor = None
+
+
+def _init_text_processor_worker():
+    global _worker_text_processor
+    _worker_text_processor = TextProcessor()
+    _worker_text_processor.warm_up()
+
+
+def _preprocess_in_worker(sents: List[str], lang: str) -> Tuple[List[str], List[Dict]]:
+    return _worker_text_processor.preprocess(sents, lang)
+
+
+def _postprocess_in_worker(sents: List[str], placeholder_entity_map: List[Dict], lang: str) -> List[str]:
+    return _worker_text_processor.postprocess(sents, placeholder_entity_map, lang)
+
+
+class Model(TextProcessor):
     """
     Model class to run the IndicTransv2 models using python interface.
     """
@@ -126,6 +478,15 @@ class Model:
         device: str = "cuda",
         input_lang_code_format: str = "flores",
         model_type: str = "ctranslate2",
+        cache_size: int = 10000,
+        num_workers: int = 0,
+        pipeline_chunk_size: int = 64,
+        length_bucketing: bool = True,
+        max_input_length: Optional[int] = None,
+        decoding_profile: str = DEFAULT_DECODING_PROFILE,
+        decoding_profiles: Optional[Dict[str, DecodingProfile]] = None,
+        intra_threads: int = 0,
+        stage_timers: Optional[StageTimers] = None,
     ):
         """
         Initialize the model class.
@@ -133,12 +494,39 @@ class Model:
         Args:
             ckpt_dir (str): path of the model checkpoint directory.
             device (str, optional): where to load the model (defaults: cuda).
+            cache_size (int, optional): number of preprocessed sentences whose translations are cached
+                across requests, 0 disables the cache (defaults: 10000).
+            num_workers (int, optional): number of worker processes for pre/post-processing; when set, sentences
+                are processed in chunks that overlap with translation, 0 processes in-line (defaults: 0).
+            pipeline_chunk_size (int, optional): sentences per chunk when `num_workers` is set (defaults: 64).
+            length_bucketing (bool, optional): decode sentences in order of their SPM length so that batches
+                group sentences of similar length and need less padding (defaults: True).
+            max_input_length (int, optional): maximum model input length in SPM tokens, including language tags;
+                longer sentences are translated in chunks (defaults: 160 for ctranslate2, 256 for fairseq).
+            decoding_profile (str, optional): name of the `decoding_profiles` entry used when a call does not
+                select one; profiles apply to the ctranslate2 backend only (defaults: quality).
+            decoding_profiles (Dict[str, DecodingProfile], optional): profiles selectable by name for this model
+                (defaults: `DECODING_PROFILES`).
+            intra_threads (int, optional): computation threads of the ctranslate2 translator, 0 uses the
+                ctranslate2 default (defaults: 0).
+            stage_timers (StageTimers, optional): registry that times the pipeline stages (`PIPELINE_STAGES`) per
+                language; stages run in the processing pool are not timed (defaults: a new enabled registry).
         """
+        super().__init__()
         self.ckpt_dir = ckpt_dir
-        self.en_tok = MosesTokenizer(lang="en")
-        self.en_normalizer = MosesPunctNormalizer()
-        self.en_detok = MosesDetokenizer(lang="en")
-        self.xliterator = unicode_transliterate.UnicodeIndicTransliterator()
+        self.pipeline_chunk_size = pipeline_chunk_size
+        self.num_workers = num_workers
+        self.length_bucketing = length_bucketing
+        self.decoding_profiles = decoding_profiles if decoding_profiles is not None else DECODING_PROFILES
+        self.decoding_profile = self.get_decoding_profile(decoding_profile)
+        self.timers = stage_timers if stage_timers is not None else StageTimers()
+        self.processing_pool = None
+        if num_workers > 0:
+            self.processing_pool = ProcessPoolExecutor(
+                max_workers=num_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_text_processor_worker,
+            )
 
         print("Initializing sentencepiece model for SRC and TGT")
         self.sp_src = spm.SentencePieceProcessor(
@@ -149,6 +537,7 @@ class Model:
         )
 
         self.input_lang_code_format = input_lang_code_format
+        self.sentence_cache = SentenceCache(cache_size) if cache_size > 0 else None
 
         print("Initializing model for translation")
         # initialize the model
@@ -156,9 +545,10 @@ class Model:
             import ctranslate2
 
             self.translator = ctranslate2.Translator(
-                self.ckpt_dir, device=device
+                self.ckpt_dir, device=device, intra_threads=intra_threads
             )  # , compute_type="auto")
             self.translate_lines = self.ctranslate2_translate_lines
+            self.max_input_length = max_input_length or CT2_MAX_INPUT_LENGTH
         elif model_type == "fairseq":
             from .custom_interactive import Translator
 
@@ -168,36 +558,237 @@ class Model:
                 batch_size=100,
             )
             self.translate_lines = self.fairseq_translate_lines
+            self.max_input_length = max_input_length or MAX_SEQ_LEN
         else:
             raise NotImplementedError(f"Unknown model_type: {model_type}")
 
-    def ctranslate2_translate_lines(self, lines: List[str]) -> List[str]:
-        tokenized_sents = [x.strip().split(" ") for x in lines]
+    def get_decoding_profile(self, decoding_profile: Optional[str] = None) -> str:
+        """Returns the profile name to use for a call, validating it against the model's profiles."""
+        if decoding_profile is None:
+            return self.decoding_profile
+        if decoding_profile not in self.decoding_profiles:
+            raise ValueError(
+                f"Unknown decoding profile: {decoding_profile}, expected one of {sorted(self.decoding_profiles)}"
+            )
+        return decoding_profile
+
+    def ctranslate2_translate_lines(self, lines: List[List[str]], decoding_profile: str) -> List[str]:
+        profile = self.decoding_profiles[decoding_profile]
+        longest_input = max((len(line) for line in lines), default=0)
         translations = self.translator.translate_batch(
-            tokenized_sents,
+            lines,
             max_batch_size=9216,
             batch_type="tokens",
-            max_input_length=160,
-            max_decoding_length=256,
-            beam_size=5,
+            max_input_length=self.max_input_length,
+            max_decoding_length=min(
+                MAX_SEQ_LEN, int(profile.length_ratio * longest_input) + profile.length_margin
+            ),
+            beam_size=profile.beam_size,
         )
         translations = [" ".join(x.hypotheses[0]) for x in translations]
         return translations
 
-    def fairseq_translate_lines(self, lines: List[str]) -> List[str]:
-        return self.translator.translate(lines)
+    def fairseq_translate_lines(self, lines: List[List[str]], decoding_profile: str) -> List[str]:
+        # the fairseq generator is configured once at load time and does not support profiles
+        return self.translator.translate([" ".join(line) for line in lines])
+
+    def bucketed_translate_lines(self, lines: List[List[str]], decoding_profile: str) -> List[str]:
+        """
+        Translates preprocessed lines in order of their SPM length and restores the input order
+        afterwards, so that every decoding batch holds sentences of similar length.
+
+        Args:
+            lines (List[List[str]]): preprocessed input lines as token lists.
+
+        Returns:
+            List[str]: raw model outputs aligned with `lines`.
+        """
+        if not self.length_bucketing or len(lines) < 2:
+            return self.translate_lines(lines, decoding_profile)
+
+        order = sorted(range(len(lines)), key=lambda i: len(lines[i]))
+        sorted_translations = self.translate_lines([lines[i] for i in order], decoding_profile)
+
+        translations = [None] * len(lines)
+        for i, translation in zip(order, sorted_translations):
+            translations[i] = translation
+        return translations
+
+    def cached_translate_lines(self, lines: List[List[str]], decoding_profile: str) -> List[str]:
+        """
+        Translates preprocessed (SPM-encoded and language-tagged) lines, consulting the sentence cache
+        first. Only cache misses are sent to the translator, each distinct line at most once, and the
+        results are stitched back in the input order.
+
+        Args:
+            lines (List[List[str]]): preprocessed input lines as token lists.
+
+        Returns:
+            List[str]: raw model outputs aligned with `lines`.
+        """
+        if self.sentence_cache is None:
+            return self.bucketed_translate_lines(lines, decoding_profile)
+
+        keys = [(decoding_profile, *line) for line in lines]
+        translations, miss_ids = self.sentence_cache.lookup(keys)
+        if miss_ids:
+            unique_misses = list(dict.fromkeys(keys[i] for i in miss_ids))
+            miss_translations = dict(
+                zip(unique_misses, self.bucketed_translate_lines([list(key[1:]) for key in unique_misses], decoding_profile))
+            )
+            self.sentence_cache.update(miss_translations.items())
+            for i in miss_ids:
+                translations[i] = miss_translations[keys[i]]
+
+        return translations
+
+    def chunked_translate_lines(
+        self, lines: List[List[str]], decoding_profile: Optional[str] = None
+    ) -> List[str]:
+        """
+        Translates preprocessed lines, splitting the ones longer than `max_input_length` into chunks at
+        natural boundaries. Each chunk is tagged and translated on its own and the chunk outputs are
+        joined back, so long inputs are translated completely instead of being cut off by the model.
+
+        Args:
+            lines (List[List[str]]): preprocessed (SPM-encoded and language-tagged) input lines as token lists.
+            decoding_profile (str, optional): name of the decoding profile (defaults: the model's profile).
+
+        Returns:
+            List[str]: raw model outputs aligned with `lines`.
+        """
+        decoding_profile = self.get_decoding_profile(decoding_profile)
+        max_len = self.max_input_length - NUM_SPECIAL_TOKENS
+        # chunks of mixed source languages are timed under "mixed"
+        langs = {line[0] for line in lines}
+        decode_timer = self.timers.time("decode", langs.pop() if len(langs) == 1 else "mixed", len(lines))
+        if all(len(line) <= max_len + 2 for line in lines):
+            with decode_timer:
+                return self.cached_translate_lines(lines, decoding_profile)
+
+        chunk_lines, chunk_counts = [], []
+        for line in lines:
+            chunks = split_long_tokens(line[2:], max_len)
+            chunk_lines.extend(line[:2] + chunk for chunk in chunks)
+            chunk_counts.append(len(chunks))
+
+        with decode_timer:
+            chunk_translations = self.cached_translate_lines(chunk_lines, decoding_profile)
+        translations, start = [], 0
+        for count in chunk_counts:
+            translations.append(" ".join(chunk_translations[start : start + count]))
+            start += count
+        return translations
+
+    def warm_up(self, langs: Optional[List[str]] = None) -> None:
+        """
+        Prebuilds the per-language tools, sentence splitters and processing pool workers, so that
+        the first requests do not pay the setup cost.
+
+        Args:
+            langs (List[str], optional): flores language codes (defaults: all supported languages).
+        """
+        super().warm_up(langs)
+        for lang in langs or list(flores_codes):
+            split_sentences(WARM_UP_TEXT + " " + WARM_UP_TEXT, lang)
+        if self.processing_pool is not None:
+            # workers warm themselves up in their initializer, make sure all of them are started
+            warm_up_futures = [
+                self.processing_pool.submit(_preprocess_in_worker, [WARM_UP_TEXT], "eng_Latn")
+                for _ in range(self.num_workers)
+            ]
+            for future in warm_up_futures:
+                future.result()
+        self.timers.reset()
+
+    def split_sentences(self, paragraph: str, lang: str) -> List[str]:
+        """Splits a paragraph into sentences with `split_sentences`, timed as the "split" stage."""
+        with self.timers.time("split", lang):
+            return split_sentences(paragraph, lang)
+
+    def close(self) -> None:
+        """Shuts down the processing pool, if any."""
+        if self.processing_pool is not None:
+            self.processing_pool.shutdown()
+            self.processing_pool = None
+
+    def pipelined_translate(
+        self, jobs: List[Tuple[List[str], str, str]], decoding_profile: Optional[str] = None
+    ) -> Iterator[Tuple[int, List[str]]]:
+        """
+        Translates batches of sentences with pre/post-processing sharded across the processing pool.
+
+        Sentences are split into chunks of `pipeline_chunk_size`. All chunks are queued for preprocessing
+        up front; the calling thread then encodes and translates each chunk as soon as it is preprocessed
+        and hands the translations back to the pool for postprocessing, so the pool works on later and
+        earlier chunks while the current one is being decoded.
+
+        Args:
+            jobs (List[Tuple[List[str], str, str]]): batches to translate, each in format: (sentences, src_lang, tgt_lang)
+                with flores language codes.
+            decoding_profile (str, optional): name of the decoding profile (defaults: the model's profile).
 
-    def paragraphs_batch_translate__multilingual(self, batch_payloads: List[tuple]) -> List[str]:
+        Yields:
+            Tuple[int, List[str]]: the job index and the next chunk of its postprocessed translations,
+                in input order.
+        """
+        assert self.processing_pool is not None, "pipelined_translate requires num_workers > 0"
+
+        chunks = []
+        for job_id, (sents, src_lang, tgt_lang) in enumerate(jobs):
+            for start in range(0, len(sents), self.pipeline_chunk_size):
+                chunks.append((job_id, sents[start : start + self.pipeline_chunk_size], src_lang, tgt_lang))
+
+        preprocess_futures = [
+            self.processing_pool.submit(_preprocess_in_worker, chunk_sents, src_lang)
+            for _, chunk_sents, src_lang, _ in chunks
+        ]
+
+        postprocess_futures = deque()
+        for (job_id, _, src_lang, tgt_lang), preprocess_future in zip(chunks, preprocess_futures):
+            preprocessed_sents, placeholder_entity_map_sents = preprocess_future.result()
+            tagged_sents, placeholder_entity_map_sents = self.encode_preprocessed(
+                preprocessed_sents, placeholder_entity_map_sents, src_lang, tgt_lang
+            )
+            translations = self.chunked_translate_lines(tagged_sents, decoding_profile)
+            postprocess_futures.append((job_id, self.processing_pool.submit(
+                _postprocess_in_worker, translations, placeholder_entity_map_sents, tgt_lang
+            )))
+
+            while postprocess_futures and postprocess_futures[0][1].done():
+                job_id, postprocess_future = postprocess_futures.popleft()
+                yield job_id, postprocess_future.result()
+
+        while postprocess_futures:
+            job_id, postprocess_future = postprocess_futures.popleft()
+            yield job_id, postprocess_future.result()
+
+    def paragraphs_batch_translate__multilingual(
+        self, batch_payloads: List[tuple], decoding_profile: Optional[str] = None
+    ) -> List[str]:
         """
         Translates a batch of input paragraphs (including pre/post processing)
         from any language to any language.
 
         Args:
             batch_payloads (List[tuple]): batch of long input-texts to be translated, each in format: (paragraph, src_lang, tgt_lang)
+            decoding_profile (str, optional): name of the decoding profile (defaults: the model's profile).
 
         Returns:
             List[str]: batch of paragraph-translations in the respective languages.
         """
+        if self.processing_pool is not None:
+            jobs = []
+            for paragraph, src_lang, tgt_lang in batch_payloads:
+                if self.input_lang_code_format == "iso":
+                    src_lang, tgt_lang = iso_to_flores[src_lang], iso_to_flores[tgt_lang]
+                jobs.append((self.split_sentences(paragraph, src_lang), src_lang, tgt_lang))
+
+            translated_sents = [[] for _ in jobs]
+            for job_id, postprocessed_sents in self.pipelined_translate(jobs, decoding_profile):
+                translated_sents[job_id].extend(postprocessed_sents)
+            return [" ".join(sents) for sents in translated_sents]
+
         paragraph_id_to_sentence_range = []
         global__sents = []
         global__preprocessed_sents = []
@@ -208,7 +799,7 @@ class Model:
             if self.input_lang_code_format == "iso":
                 src_lang, tgt_lang = iso_to_flores[src_lang], iso_to_flores[tgt_lang]
 
-            batch = split_sentences(paragraph, src_lang)
+            batch = self.split_sentences(paragraph, src_lang)
             global__sents.extend(batch)
 
             preprocessed_sents, placeholder_entity_map_sents = self.preprocess_batch(
@@ -222,7 +813,7 @@ class Model:
                 (global_sentence_start_index, len(global__preprocessed_sents))
             )
 
-        translations = self.translate_lines(global__preprocessed_sents)
+        translations = self.chunked_translate_lines(global__preprocessed_sents, decoding_profile)
 
         translated_paragraphs = []
         for paragraph_id, sentence_range in enumerate(paragraph_id_to_sentence_range):
@@ -242,8 +833,78 @@ class Model:
 
         return translated_paragraphs
 
+    def paragraphs_batch_translate__multilingual_stream(
+        self, batch_payloads: List[tuple], micro_batch_size: int = 16, decoding_profile: Optional[str] = None
+    ) -> Iterator[Tuple[int, str]]:
+        """
+        Streaming variant of `paragraphs_batch_translate__multilingual`: translated sentences are
+        yielded in input order as soon as the decode micro-batch containing them finishes, instead
+        of after the whole batch has been translated.
+
+        Args:
+            batch_payloads (List[tuple]): batch of long input-texts to be translated, each in format: (paragraph, src_lang, tgt_lang)
+            micro_batch_size (int, optional): sentences decoded together; ignored when the processing pool is
+                used, which streams per `pipeline_chunk_size` chunk (defaults: 16).
+            decoding_profile (str, optional): name of the decoding profile (defaults: the model's profile).
+
+        Yields:
+            Tuple[int, str]: the paragraph index and its next translated sentence.
+        """
+        jobs = []
+        for paragraph, src_lang, tgt_lang in batch_payloads:
+            if self.input_lang_code_format == "iso":
+                src_lang, tgt_lang = iso_to_flores[src_lang], iso_to_flores[tgt_lang]
+            jobs.append((self.split_sentences(paragraph, src_lang), src_lang, tgt_lang))
+
+        if self.processing_pool is not None:
+            for job_id, postprocessed_sents in self.pipelined_translate(jobs, decoding_profile):
+                for sent in postprocessed_sents:
+                    yield job_id, sent
+            return
+
+        for job_id, (sents, src_lang, tgt_lang) in enumerate(jobs):
+            for start in range(0, len(sents), micro_batch_size):
+                preprocessed_sents, placeholder_entity_map_sents = self.preprocess_batch(
+                    sents[start : start + micro_batch_size], src_lang, tgt_lang
+                )
+                translations = self.chunked_translate_lines(preprocessed_sents, decoding_profile)
+                for sent in self.postprocess(translations, placeholder_entity_map_sents, tgt_lang):
+                    yield job_id, sent
+
+    def translate_paragraph_stream(
+        self,
+        paragraph: str,
+        src_lang: str,
+        tgt_lang: str,
+        micro_batch_size: int = 16,
+        decoding_profile: Optional[str] = None,
+    ) -> Iterator[str]:
+        """
+        Translates an input text paragraph, yielding the translated sentences in order as each
+        decode micro-batch finishes. Joining the yielded sentences with " " gives the output of
+        `translate_paragraph`.
+
+        Args:
+            paragraph (str): input text paragraph to be translated.
+            src_lang (str): flores source language code.
+            tgt_lang (str): flores target language code.
+            micro_batch_size (int, optional): sentences decoded together (defaults: 16).
+            decoding_profile (str, optional): name of the decoding profile (defaults: the model's profile).
+
+        Yields:
+            str: the next translated sentence.
+        """
+        assert isinstance(paragraph, str)
+
+        for _, sent in self.paragraphs_batch_translate__multilingual_stream(
+            [(paragraph, src_lang, tgt_lang)], micro_batch_size, decoding_profile
+        ):
+            yield sent
+
     # translate a batch of sentences from src_lang to tgt_lang
-    def batch_translate(self, batch: List[str], src_lang: str, tgt_lang: str) -> List[str]:
+    def batch_translate(
+        self, batch: List[str], src_lang: str, tgt_lang: str, decoding_profile: Optional[str] = None
+    ) -> List[str]:
         """
         Translates a batch of input sentences (including pre/post processing)
         from source language to target language.
@@ -252,6 +913,7 @@ class Model:
             batch (List[str]): batch of input sentences to be translated.
             src_lang (str): flores source language code.
             tgt_lang (str): flores target language code.
+            decoding_profile (str, optional): name of the decoding profile (defaults: the model's profile).
 
         Returns:
             List[str]: batch of translated-sentences generated by the model.
@@ -262,14 +924,22 @@ class Model:
         if self.input_lang_code_format == "iso":
             src_lang, tgt_lang = iso_to_flores[src_lang], iso_to_flores[tgt_lang]
 
+        if self.processing_pool is not None:
+            translated_sents = []
+            for _, postprocessed_sents in self.pipelined_translate([(batch, src_lang, tgt_lang)], decoding_profile):
+                translated_sents.extend(postprocessed_sents)
+            return translated_sents
+
         preprocessed_sents, placeholder_entity_map_sents = self.preprocess_batch(
             batch, src_lang, tgt_lang
         )
-        translations = self.translate_lines(preprocessed_sents)
+        translations = self.chunked_translate_lines(preprocessed_sents, decoding_profile)
         return self.postprocess(translations, placeholder_entity_map_sents, tgt_lang)
 
     # translate a paragraph from src_lang to tgt_lang
-    def translate_paragraph(self, paragraph: str, src_lang: str, tgt_lang: str) -> str:
+    def translate_paragraph(
+        self, paragraph: str, src_lang: str, tgt_lang: str, decoding_profile: Optional[str] = None
+    ) -> str:
         """
         Translates an input text paragraph (including pre/post processing)
         from source language to target language.
@@ -278,6 +948,7 @@ class Model:
             paragraph (str): input text paragraph to be translated.
             src_lang (str): flores source language code.
             tgt_lang (str): flores target language code.
+            decoding_profile (str, optional): name of the decoding profile (defaults: the model's profile).
 
         Returns:
             str: paragraph translation generated by the model.
@@ -290,13 +961,15 @@ class Model:
         else:
             flores_src_lang = src_lang
 
-        sents = split_sentences(paragraph, flores_src_lang)
-        postprocessed_sents = self.batch_translate(sents, src_lang, tgt_lang)
+        sents = self.split_sentences(paragraph, flores_src_lang)
+        postprocessed_sents = self.batch_translate(sents, src_lang, tgt_lang, decoding_profile)
         translated_paragraph = " ".join(postprocessed_sents)
 
         return translated_paragraph
 
-    def preprocess_batch(self, batch: List[str], src_lang: str, tgt_lang: str) -> List[str]:
+    def preprocess_batch(
+        self, batch: List[str], src_lang: str, tgt_lang: str
+    ) -> Tuple[List[List[str]], List[Dict]]:
         """
         Preprocess an array of sentences by normalizing, tokenization, and possibly transliterating it. It also tokenizes the
         normalized text sequences using sentence piece tokenizer and also adds language tags.
@@ -307,166 +980,48 @@ class Model:
             tgt_lang (str): flores language code of the output text sentences.
 
         Returns:
-            Tuple[List[str], List[Dict]]: a tuple of list of preprocessed input text sentences and also a corresponding list of dictionary
-                mapping placeholders to their original values.
+            Tuple[List[List[str]], List[Dict]]: a tuple of list of preprocessed input text sentences as SPM token lists and also a
+                corresponding list of dictionary mapping placeholders to their original values.
         """
         preprocessed_sents, placeholder_entity_map_sents = self.preprocess(batch, lang=src_lang)
-        tokenized_sents = self.apply_spm(preprocessed_sents)
-        tokenized_sents, placeholder_entity_map_sents = truncate_long_sentences(
-            tokenized_sents, placeholder_entity_map_sents
+        return self.encode_preprocessed(
+            preprocessed_sents, placeholder_entity_map_sents, src_lang, tgt_lang
         )
-        tagged_sents = apply_lang_tags(tokenized_sents, src_lang, tgt_lang)
-        return tagged_sents, placeholder_entity_map_sents
-
-    def apply_spm(self, sents: List[str]) -> List[str]:
-        """
-        Applies sentence piece encoding to the batch of input sentences.
-
-        Args:
-            sents (List[str]): batch of the input sentences.
-
-        Returns:
-            List[str]: batch of encoded sentences with sentence piece model
-        """
-        return [" ".join(self.sp_src.encode(sent, out_type=str)) for sent in sents]
 
-    def preprocess_sent(
+    def encode_preprocessed(
         self,
-        sent: str,
-        normalizer: Union[MosesPunctNormalizer, indic_normalize.IndicNormalizerFactory],
-        lang: str,
-    ) -> Tuple[str, Dict]:
-        """
-        Preprocess an input text sentence by normalizing, tokenization, and possibly transliterating it.
-
-        Args:
-            sent (str): input text sentence to preprocess.
-            normalizer (Union[MosesPunctNormalizer, indic_normalize.IndicNormalizerFactory]): an object that performs normalization on the text.
-            lang (str): flores language code of the input text sentence.
-
-        Returns:
-            Tuple[str, Dict]: A tuple containing the preprocessed input text sentence and a corresponding dictionary
-            mapping placeholders to their original values.
-        """
-        iso_lang = flores_codes[lang]
-        sent = punc_norm(sent, iso_lang)
-        sent, placeholder_entity_map = normalize(sent)
-
-        transliterate = True
-        if lang.split("_")[1] in ["Arab", "Aran", "Olck", "Mtei", "Latn"]:
-            transliterate = False
-
-        if iso_lang == "en":
-            processed_sent = " ".join(
-                self.en_tok.tokenize(self.en_normalizer.normalize(sent.strip()), escape=False)
-            )
-        elif transliterate:
-            # transliterates from the any specific language to devanagari
-            # which is why we specify lang2_code as "hi".
-            processed_sent = self.xliterator.transliterate(
-                " ".join(
-                    indic_tokenize.trivial_tokenize(normalizer.normalize(sent.strip()), iso_lang)
-                ),
-                iso_lang,
-                "hi",
-            ).replace(" ् ", "्")
-        else:
-            # we only need to transliterate for joint training
-            processed_sent = " ".join(
-                indic_tokenize.trivial_tokenize(normalizer.normalize(sent.strip()), iso_lang)
-            )
-
-        return processed_sent, placeholder_entity_map
-
-    def preprocess(self, sents: List[str], lang: str):
+        preprocessed_sents: List[str],
+        placeholder_entity_map_sents: List[Dict],
+        src_lang: str,
+        tgt_lang: str,
+    ) -> Tuple[List[List[str]], List[Dict]]:
         """
-        Preprocess an array of sentences by normalizing, tokenization, and possibly transliterating it.
+        Encodes already preprocessed sentences with the sentence piece tokenizer and adds language
+        tags. Sentences longer than the model input are chunked at translation time.
 
         Args:
-            batch (List[str]): input list of sentences to preprocess.
-            lang (str): flores language code of the input text sentences.
+            preprocessed_sents (List[str]): sentences returned by `preprocess`.
+            placeholder_entity_map_sents (List[Dict]): placeholder maps returned by `preprocess`.
+            src_lang (str): flores language code of the input text sentences.
+            tgt_lang (str): flores language code of the output text sentences.
 
         Returns:
-            Tuple[List[str], List[Dict]]: a tuple of list of preprocessed input text sentences and also a corresponding list of dictionary
-                mapping placeholders to their original values.
+            Tuple[List[List[str]], List[Dict]]: a tuple of list of model inputs as token lists and the corresponding list
+                of dictionary mapping placeholders to their original values.
         """
-        processed_sents, placeholder_entity_map_sents = [], []
-
-        if lang == "eng_Latn":
-            normalizer = None
-        else:
-            normfactory = indic_normalize.IndicNormalizerFactory()
-            normalizer = normfactory.get_normalizer(flores_codes[lang])
-
-        for sent in sents:
-            sent, placeholder_entity_map = self.preprocess_sent(sent, normalizer, lang)
-            processed_sents.append(sent)
-            placeholder_entity_map_sents.append(placeholder_entity_map)
-
-        return processed_sents, placeholder_entity_map_sents
+        with self.timers.time("spm", src_lang, len(preprocessed_sents)):
+            tokenized_sents = self.apply_spm(preprocessed_sents)
+        tagged_sents = [[src_lang, tgt_lang] + tokens for tokens in tokenized_sents]
+        return tagged_sents, placeholder_entity_map_sents
 
-    def postprocess(
-        self,
-        sents: List[str],
-        placeholder_entity_map: List[Dict],
-        lang: str,
-        common_lang: str = "hin_Deva",
-    ) -> List[str]:
+    def apply_spm(self, sents: List[str]) -> List[List[str]]:
         """
-        Postprocesses a batch of input sentences after the translation generations.
+        Applies sentence piece encoding to the batch of input sentences in a single call.
 
         Args:
-            sents (List[str]): batch of translated sentences to postprocess.
-            placeholder_entity_map (List[Dict]): dictionary mapping placeholders to the original entity values.
-            lang (str): flores language code of the input sentences.
-            common_lang (str, optional): flores language code of the transliterated language (defaults: hin_Deva).
+            sents (List[str]): batch of the input sentences.
 
         Returns:
-            List[str]: postprocessed batch of input sentences.
+            List[List[str]]: batch of sentences encoded with sentence piece model, as token lists.
         """
-
-        lang_code, script_code = lang.split("_")
-        # SPM decode
-        for i in range(len(sents)):
-            # sent_tokens = sents[i].split(" ")
-            # sents[i] = self.sp_tgt.decode(sent_tokens)
-
-            sents[i] = sents[i].replace(" ", "").replace("▁", " ").strip()
-
-            # Fixes for Perso-Arabic scripts
-            # TODO: Move these normalizations inside indic-nlp-library
-            if script_code in {"Arab", "Aran"}:
-                # UrduHack adds space before punctuations. Since the model was trained without fixing this issue, let's fix it now
-                sents[i] = sents[i].replace(" ؟", "؟").replace(" ۔", "۔").replace(" ،", "،")
-                # Kashmiri bugfix for palatalization: https://github.com/AI4Bharat/IndicTrans2/issues/11
-                sents[i] = sents[i].replace("ٮ۪", "ؠ")
-
-        assert len(sents) == len(placeholder_entity_map)
-
-        for i in range(0, len(sents)):
-            for key in placeholder_entity_map[i].keys():
-                sents[i] = sents[i].replace(key, placeholder_entity_map[i][key])
-
-        # Detokenize and transliterate to native scripts if applicable
-        postprocessed_sents = []
-
-        if lang == "eng_Latn":
-            for sent in sents:
-                postprocessed_sents.append(self.en_detok.detokenize(sent.split(" ")))
-        else:
-            for sent in sents:
-                outstr = indic_detokenize.trivial_detokenize(
-                    self.xliterator.transliterate(
-                        sent, flores_codes[common_lang], flores_codes[lang]
-                    ),
-                    flores_codes[lang],
-                )
-                
-                # Oriya bug: indic-nlp-library produces ଯ଼ instead of ୟ when converting from Devanagari to Odia
-                # TODO: Find out what's the issue with unicode transliterator for Oriya and fix it
-                if lang_code == "ory":
-                    outstr = outstr.replace("ଯ଼", 'ୟ')
-
-                postprocessed_sents.append(outstr)
-
-        return postprocessed_sents
+        return self.sp_src.encode(sents, out_type=str)
@@ -0,0 +1,148 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Iterable, List, Optional
+
+
+class ModelManager:
+    """
+    Keeps a bounded number of translation models resident in memory.
+
+    Models are loaded on demand through the `loader` callable and tracked in
+    least-recently-used order. When loading a new model would exceed
+    `max_resident`, the least-recently-used model that is not pinned is evicted.
+    Pinned models are never evicted, so if every resident model is pinned the
+    limit is temporarily exceeded instead of failing the request.
+    """
+
+    def __init__(
+        self,
+        loader: Callable[[str], Any],
+        max_resident: int = 2,
+        pinned: Iterable[str] = (),
+        unloader: Optional[Callable[[str, Any], None]] = None,
+    ):
+        """
+        Initialize the model manager.
+
+        Args:
+            loader (Callable[[str], Any]): function that loads and returns the model for a key.
+            max_resident (int, optional): maximum number of models kept in memory (defaults: 2).
+            pinned (Iterable[str], optional): keys that are never evicted once loaded (defaults: none).
+            unloader (Callable[[str, Any], None], optional): called with the key and model after eviction,
+                e.g. to release accelerator memory (defaults: None).
+        """
+        if max_resident < 1:
+            raise ValueError(f"max_resident must be at least 1, got {max_resident}")
+
+        self.loader = loader
+        self.unloader = unloader
+        self.max_resident = max_resident
+        self.pinned = set(pinned)
+
+        self._models: "OrderedDict[str, Any]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._load_locks: Dict[str, threading.Lock] = {}
+        self._stats: Dict[str, Dict[str, float]] = {}
+
+    def _stats_for(self, key: str) -> Dict[str, float]:
+        if key not in self._stats:
+            self._stats[key] = {
+                "hits": 0,
+                "misses": 0,
+                "loads": 0,
+                "evictions": 0,
+                "load_seconds_total": 0.0,
+                "last_load_seconds": 0.0,
+            }
+        return self._stats[key]
+
+    def get(self, key: str) -> Any:
+        """
+        Returns the model for `key`, loading it (and evicting others) if required.
+
+        Args:
+            key (str): model key, e.g. a direction string such as "en-indic".
+
+        Returns:
+            Any: the loaded model.
+        """
+        with self._lock:
+            if key in self._models:
+                self._models.move_to_end(key)
+                self._stats_for(key)["hits"] += 1
+                return self._models[key]
+            self._stats_for(key)["misses"] += 1
+            load_lock = self._load_locks.setdefault(key, threading.Lock())
+
+        # Loads for different keys may run concurrently, concurrent requests
+        # for the same key wait for the first load instead of duplicating it.
+        with load_lock:
+            with self._lock:
+                if key in self._models:
+                    self._models.move_to_end(key)
+                    return self._models[key]
+
+            start_time = time.perf_counter()
+            model = self.loader(key)
+            load_seconds = time.perf_counter() - start_time
+
+            with self._lock:
+                stats = self._stats_for(key)
+                stats["loads"] += 1
+                stats["load_seconds_total"] += load_seconds
+                stats["last_load_seconds"] = load_seconds
+                self._models[key] = model
+                evicted = self._evict_overflow(keep=key)
+
+        for evicted_key, evicted_model in evicted:
+            if self.unloader is not None:
+                self.unloader(evicted_key, evicted_model)
+
+        return model
+
+    def _evict_overflow(self, keep: str) -> List[tuple]:
+        """Evicts least-recently-used unpinned models until within `max_resident`. Caller holds the lock."""
+        evicted = []
+        for candidate in list(self._models):
+            if len(self._models) <= self.max_resident:
+                break
+            if candidate == keep or candidate in self.pinned:
+                continue
+            evicted.append((candidate, self._models.pop(candidate)))
+            self._stats_for(candidate)["evictions"] += 1
+        return evicted
+
+    def preload(self, keys: Iterable[str]) -> None:
+        """Loads the given keys eagerly, e.g. at server startup."""
+        for key in keys:
+            self.get(key)
+
+    def pin(self, key: str) -> None:
+        """Protects `key` from eviction."""
+        with self._lock:
+            self.pinned.add(key)
+
+    def unpin(self, key: str) -> None:
+        """Makes `key` eligible for eviction again."""
+        with self._lock:
+            self.pinned.discard(key)
+
+    def is_resident(self, key: str) -> bool:
+        with self._lock:
+            return key in self._models
+
+    def resident(self) -> List[str]:
+        """Returns the resident keys, least-recently-used first."""
+        with self._lock:
+            return list(self._models)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Returns residency, hit/miss and load-time metrics for all keys seen so far."""
+        with self._lock:
+            return {
+                "max_resident": self.max_resident,
+                "resident": list(self._models),
+                "pinned": sorted(self.pinned),
+                "models": {key: dict(stats) for key, stats in self._stats.items()},
+            }
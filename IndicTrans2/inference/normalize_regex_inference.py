@@ -1,3 +1,4 @@
+from functools import lru_cache
 from typing import Tuple
 import regex as re
 import sys
@@ -13,6 +14,16 @@ NUMERAL_PATTERN = r"(~?\d+\.?\d*\s?%?\s?-?\s?~?\d+\.?\d*\s?%|~?\d+%|\d+[-\/.,:']
 OTHER_PATTERN = r'[A-Za-z0-9]*[#|@]\w+'
 
 
+# Set of Translations of "ID" in all the suppported languages have been collated.
+# This has been added to deal with edge cases where placeholders might get translated.
+INDIC_FAILURE_CASES = ['آی ڈی ', 'ꯑꯥꯏꯗꯤ', 'आईडी', 'आई . डी . ', 'ऐटि', 'آئی ڈی ', 'ᱟᱭᱰᱤ ᱾', 'आयडी', 'ऐडि', 'आइडि']
+
+INDIC_NUM_TABLE = str.maketrans(INDIC_NUM_MAP)
+WHITESPACE_PATTERN = re.compile(r"\s+")
+# any "<...>" span, every placeholder variant has this shape
+PLACEHOLDER_TOKEN_PATTERN = re.compile(r"<[^<>]+>")
+
+
 def normalize_indic_numerals(line: str):
     """
     Normalize the numerals in Indic languages from native script to Roman script (if present).
@@ -23,13 +34,53 @@ def normalize_indic_numerals(line: str):
     Returns:
         str: an input string with the all Indic numerals normalized to Roman script.
     """
-    return "".join([INDIC_NUM_MAP.get(c, c) for c in line])
+    return line.translate(INDIC_NUM_TABLE)
+
+
+@lru_cache(maxsize=None)
+def placeholder_variants(serial_no: int) -> Tuple[str, ...]:
+    """
+    Returns every placeholder variant the model may emit for the given serial number: the
+    placeholder itself, its spaced form and the forms where "ID" got translated. The table is
+    generated once per serial number and reused across sentences.
+    
+    Args:
+        serial_no (int): serial number of the placeholder within a sentence.
+    
+    Returns:
+        Tuple[str, ...]: placeholder variants, the canonical placeholder first.
+    """
+    variants = ["<ID{}>".format(serial_no), "< ID{} >".format(serial_no)]
+    for i in INDIC_FAILURE_CASES:
+        variants.append("<{}{}>".format(i, serial_no))
+        variants.append("< {}{} >".format(i, serial_no))
+        variants.append("< {} {} >".format(i, serial_no))
+    return tuple(variants)
+
+
+@lru_cache(maxsize=None)
+def compile_placeholder_pattern(pattern: str):
+    """Compiles a placeholder pattern once and reuses it across sentences."""
+    return re.compile(pattern)
+
+
+def is_placeholder_candidate(match: str, pattern: str) -> bool:
+    """Filters out matches that are too short to need placeholder based handling."""
+    if pattern == URL_PATTERN:
+        #Avoids false positive URL matches for names with initials.
+        return len(match.replace(".", '')) >= 4
+    if pattern == NUMERAL_PATTERN:
+        #Short numeral patterns do not need placeholder based handling.
+        return len(match.replace(" ", '').replace(".", '').replace(":", '')) >= 4
+    return True
 
 
 def wrap_with_placeholders(text: str, patterns: list) -> Tuple[str, dict]:
     """
     Wraps substrings with matched patterns in the given text with placeholders and returns
     the modified text along with a mapping of the placeholders to their original value.
+    Each pattern is matched with a precompiled regex and its entities are wrapped in a single
+    pass over the text; repeated occurrences of the same entity share a placeholder.
     
     Args:
         text (str): an input string which needs to be wrapped with the placeholders.
@@ -39,46 +90,34 @@ def wrap_with_placeholders(text: str, patterns: list) -> Tuple[str, dict]:
         Tuple[str, dict]: a tuple containing the modified text and a dictionary mapping 
             placeholders to their original values.
     """
-    serial_no = 1
-    
     placeholder_entity_map = dict()
+    serial_no = 1
     
+    # patterns are applied in order of precedence over the whole text, each one to the text
+    # left by the previous ones, e.g. "1,200.50" becomes "1,<ID1>" as the URL pattern claims
+    # "200.50" before the numeral pattern sees the full number
     for pattern in patterns:
-        matches = set(re.findall(pattern, text))
+        matches = dict.fromkeys(
+            m.group() for m in compile_placeholder_pattern(pattern).finditer(text)
+            if is_placeholder_candidate(m.group(), pattern)
+        )
+        if not matches:
+            continue
         
-        # wrap common match with placeholder tags
+        entity_placeholders = dict()
         for match in matches:
-            if pattern==URL_PATTERN :
-                #Avoids false positive URL matches for names with initials.
-                temp = match.replace(".",'')
-                if len(temp)<4:
-                    continue
-            if pattern==NUMERAL_PATTERN :
-                #Short numeral patterns do not need placeholder based handling.
-                temp = match.replace(" ",'').replace(".",'').replace(":",'')
-                if len(temp)<4:
-                    continue
-            
-            #Set of Translations of "ID" in all the suppported languages have been collated.            
-            #This has been added to deal with edge cases where placeholders might get translated. 
-            indic_failure_cases = ['آی ڈی ', 'ꯑꯥꯏꯗꯤ', 'आईडी', 'आई . डी . ', 'ऐटि', 'آئی ڈی ', 'ᱟᱭᱰᱤ ᱾', 'आयडी', 'ऐडि', 'आइडि']         
-            placeholder = "<ID{}>".format(serial_no)
-            alternate_placeholder = "< ID{} >".format(serial_no)                    
-            placeholder_entity_map[placeholder] = match
-            placeholder_entity_map[alternate_placeholder] = match
-            
-            for i in indic_failure_cases:
-                placeholder_temp = "<{}{}>".format(i,serial_no)
-                placeholder_entity_map[placeholder_temp] = match
-                placeholder_temp = "< {}{} >".format(i, serial_no)
-                placeholder_entity_map[placeholder_temp] = match
-                placeholder_temp = "< {} {} >".format(i, serial_no)
-                placeholder_entity_map[placeholder_temp] = match
-            
-            text = text.replace(match, placeholder)
-            serial_no+=1
+            variants = placeholder_variants(serial_no)
+            entity_placeholders[match] = variants[0]
+            placeholder_entity_map.update(dict.fromkeys(variants, match))
+            serial_no += 1
+        
+        # every occurrence of a matched entity is wrapped, longer entities first
+        entity_pattern = re.compile("|".join(
+            re.escape(match) for match in sorted(entity_placeholders, key=len, reverse=True)
+        ))
+        text = entity_pattern.sub(lambda m: entity_placeholders[m.group()], text)
     
-    text = re.sub("\s+", " ", text)
+    text = WHITESPACE_PATTERN.sub(" ", text)
     
     #Regex has failure cases in trailing "/" in URLs, so this is a workaround. 
     text = text.replace(">/",">")
@@ -86,6 +125,26 @@ def wrap_with_placeholders(text: str, patterns: list) -> Tuple[str, dict]:
     return text, placeholder_entity_map
 
 
+def restore_placeholders(text: str, placeholder_entity_map: dict) -> str:
+    """
+    Replaces the placeholders in a translated string with their original values. Instead of
+    one `str.replace` per placeholder variant, the text is scanned once for "<...>" spans which
+    are looked up in the placeholder map.
+    
+    Args:
+        text (str): translated string that may contain placeholders.
+        placeholder_entity_map (dict): dictionary mapping placeholders to their original values.
+    
+    Returns:
+        str: the string with all known placeholders restored.
+    """
+    if not placeholder_entity_map or "<" not in text:
+        return text
+    return PLACEHOLDER_TOKEN_PATTERN.sub(
+        lambda m: placeholder_entity_map.get(m.group(), m.group()), text
+    )
+
+
 def normalize(text: str, patterns: list = [EMAIL_PATTERN, URL_PATTERN, NUMERAL_PATTERN, OTHER_PATTERN]) -> Tuple[str, dict]:
     """
     Normalizes and wraps the spans of input string with placeholder tags. It first normalizes
@@ -0,0 +1,72 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+
+
+class SentenceCache:
+    """
+    Thread-safe LRU cache of raw model outputs for preprocessed sentences.
+
+    Keys are the fully preprocessed model inputs, i.e. tuples of SPM tokens with the
+    `src_lang` and `tgt_lang` tags already prepended, led by the decoding profile name,
+    so a key identifies the (sentence, src_lang, tgt_lang, decoding profile) tuple. Values are the raw (not yet postprocessed)
+    translations, which keeps placeholder restoration per request correct.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        """
+        Initialize the sentence cache.
+
+        Args:
+            max_size (int, optional): maximum number of cached sentences (defaults: 10000).
+        """
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def lookup(self, keys: List[Hashable]) -> Tuple[List[Optional[str]], List[int]]:
+        """
+        Looks up a batch of keys.
+
+        Args:
+            keys (List[Hashable]): preprocessed sentences to look up.
+
+        Returns:
+            Tuple[List[Optional[str]], List[int]]: cached values (None for misses) aligned
+                with `keys`, and the indices of the misses.
+        """
+        values: List[Optional[str]] = []
+        miss_ids: List[int] = []
+        with self._lock:
+            for i, key in enumerate(keys):
+                value = self._entries.get(key)
+                if value is None:
+                    miss_ids.append(i)
+                else:
+                    self._entries.move_to_end(key)
+                values.append(value)
+            self.hits += len(keys) - len(miss_ids)
+            self.misses += len(miss_ids)
+        return values, miss_ids
+
+    def update(self, items: Iterable[Tuple[Hashable, str]]) -> None:
+        """Inserts (key, value) pairs, evicting the least-recently-used entries when full."""
+        with self._lock:
+            for key, value in items:
+                self._entries[key] = value
+                self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {"size": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,136 @@
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Iterator, List, Optional
+
+# per-request collectors of the current thread or asyncio task, see `StageTimers.collect`
+_collectors: ContextVar[List[Dict[str, float]]] = ContextVar("stage_timer_collectors", default=[])
+
+
+class StageTimers:
+    """
+    Thread-safe registry of wall-clock timers for the stages of the translation pipeline.
+
+    Every timed block adds to counters keyed by (language, stage): the number of calls, the number
+    of sentences processed, and the total and maximum time. The counters are cumulative for the
+    lifetime of the registry and are read with `snapshot`. In addition, `collect` gathers the
+    timings of the blocks run within it, e.g. to report the breakdown of a single request.
+
+    A disabled registry hands out a shared no-op context manager, so instrumented code costs only a
+    method call when timing is not wanted.
+    """
+
+    def __init__(self, enabled: bool = True):
+        """
+        Initialize the timer registry.
+
+        Args:
+            enabled (bool, optional): whether timed blocks are measured (defaults: True).
+        """
+        self.enabled = enabled
+        self._counters: Dict[str, Dict[str, List[float]]] = {}
+        self._lock = threading.Lock()
+        self._noop = _NoopTimer()
+
+    def time(self, stage: str, lang: str, sentences: int = 0):
+        """
+        Returns a context manager that times its block as `stage` for `lang`.
+
+        Args:
+            stage (str): name of the pipeline stage.
+            lang (str): flores code of the language the stage works on.
+            sentences (int, optional): number of sentences processed by the block (defaults: 0).
+        """
+        if not self.enabled:
+            return self._noop
+        return self._timed(stage, lang, sentences)
+
+    @contextmanager
+    def _timed(self, stage: str, lang: str, sentences: int) -> Iterator[None]:
+        start_time = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, lang, time.perf_counter() - start_time, sentences)
+
+    def record(self, stage: str, lang: str, seconds: float, sentences: int = 0) -> None:
+        """Adds an externally measured duration to the counters of (`lang`, `stage`)."""
+        with self._lock:
+            counters = self._counters.setdefault(lang, {}).get(stage)
+            if counters is None:
+                counters = self._counters[lang][stage] = [0, 0, 0.0, 0.0]
+            counters[0] += 1
+            counters[1] += sentences
+            counters[2] += seconds
+            counters[3] = max(counters[3], seconds)
+        for collector in _collectors.get():
+            collector[stage] = collector.get(stage, 0.0) + seconds
+
+    @contextmanager
+    def collect(self) -> Iterator[Dict[str, float]]:
+        """
+        Collects the total seconds per stage of the blocks timed within the `with` statement, by any
+        registry, in the current thread or asyncio task.
+
+        Yields:
+            Dict[str, float]: seconds per stage, filled in as stages complete.
+        """
+        collector: Dict[str, float] = {}
+        token = _collectors.set(_collectors.get() + [collector])
+        try:
+            yield collector
+        finally:
+            _collectors.reset(token)
+
+    def snapshot(self, lang: Optional[str] = None) -> Dict[str, Dict[str, Dict[str, float]]]:
+        """
+        Returns the counters per language and stage.
+
+        Args:
+            lang (str, optional): only return the counters of this language (defaults: all languages).
+
+        Returns:
+            Dict[str, Dict[str, Dict[str, float]]]: `{lang: {stage: {"calls", "sentences", "total_ms",
+                "mean_ms", "max_ms", "share"}}}`, where `share` is the stage's fraction of the time
+                recorded for the language.
+        """
+        with self._lock:
+            counters = {
+                counter_lang: {stage: list(values) for stage, values in stages.items()}
+                for counter_lang, stages in self._counters.items()
+                if lang is None or counter_lang == lang
+            }
+
+        snapshot = {}
+        for counter_lang, stages in sorted(counters.items()):
+            lang_seconds = sum(values[2] for values in stages.values()) or 1.0
+            snapshot[counter_lang] = {
+                stage: {
+                    "calls": calls,
+                    "sentences": sentences,
+                    "total_ms": round(1000 * seconds, 3),
+                    "mean_ms": round(1000 * seconds / calls, 3),
+                    "max_ms": round(1000 * max_seconds, 3),
+                    "share": round(seconds / lang_seconds, 4),
+                }
+                for stage, (calls, sentences, seconds, max_seconds) in stages.items()
+            }
+        return snapshot
+
+    def reset(self) -> None:
+        with self._lock:
+            self._counters.clear()
+
+
+class _NoopTimer:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, *exc_info):
+        return False
+
+
+def format_stage_timings(timings: Dict[str, float]) -> str:
+    """Formats `collect` results as a header value, e.g. `split=0.41ms, decode=182.07ms`."""
+    return ", ".join(f"{stage}={1000 * seconds:.2f}ms" for stage, seconds in timings.items())
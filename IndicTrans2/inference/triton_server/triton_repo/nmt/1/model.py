@@ -1,6 +1,9 @@
 import os
 import sys
 import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
 import numpy as np
 import triton_python_backend_utils as pb_utils
 
@@ -8,12 +11,19 @@ PWD = os.path.dirname(__file__)
 
 INFERENCE_MODULE_DIR = "/home/indicTrans2/"
 sys.path.insert(0, INFERENCE_MODULE_DIR)
-from inference.engine import Model, iso_to_flores
+from inference.engine import Model, iso_to_flores, split_sentences
 INDIC_LANGUAGES = set(iso_to_flores)
 
 ALLOWED_DIRECTION_STRINGS = {"en-indic", "indic-en", "indic-indic"}
 FORCE_PIVOTING = False
 DEFAULT_PIVOT_LANG = "en"
+# Pivot translation runs both legs concurrently on micro-batches of sentences
+PIPELINED_PIVOTING = True
+PIVOT_MICRO_BATCH_SIZE = 16
+# Feed raw SPM outputs of the first leg straight to the second leg when both models share the pivot SPM vocabulary
+PIVOT_SPM_PASSTHROUGH = True
+# Translate the direction groups of a dynamic batch concurrently, one thread per direction
+CONCURRENT_DIRECTIONS = True
 
 class TritonPythonModel:
     def initialize(self, args):
@@ -37,6 +47,7 @@ class TritonPythonModel:
             direction_string = os.path.basename(checkpoint_folder)
             assert direction_string in ALLOWED_DIRECTION_STRINGS, f"Checkpoint folder-name `{direction_string}` not allowed"
             self.models[direction_string] = Model(os.path.join(checkpoint_folder, "ct2_fp16_model"), input_lang_code_format="iso", model_type="ctranslate2")
+            self.models[direction_string].warm_up()
             # self.models[direction_string] = Model(checkpoint_folder, input_lang_code_format="iso", model_type="fairseq")
         
         self.pivot_lang = None
@@ -46,6 +57,14 @@ class TritonPythonModel:
             elif FORCE_PIVOTING:
                 del self.models["indic-indic"]
                 self.pivot_lang = DEFAULT_PIVOT_LANG
+
+        self.direction_executor = None
+        if CONCURRENT_DIRECTIONS:
+            self.direction_executor = ThreadPoolExecutor(max_workers=len(ALLOWED_DIRECTION_STRINGS))
+
+    def finalize(self):
+        if self.direction_executor is not None:
+            self.direction_executor.shutdown()
     
     def get_direction_string(self, input_language_id, output_language_id):
         direction_string = None
@@ -65,6 +84,124 @@ class TritonPythonModel:
             return self.models[direction_string]
         raise RuntimeError(f"Language-pair not supported: {input_language_id}-{output_language_id}")
 
+    def pivot_translate(self, payloads):
+        """
+        Translates indic-indic payloads via the pivot language, serially leg after leg.
+        """
+        model = self.get_model("hi", self.pivot_lang)
+        pivot_texts = model.paragraphs_batch_translate__multilingual(
+            [[text, src_lang, self.pivot_lang] for text, src_lang, _ in payloads]
+        )
+
+        model = self.get_model(self.pivot_lang, "hi")
+        return model.paragraphs_batch_translate__multilingual(
+            [[pivot_text, self.pivot_lang, tgt_lang] for pivot_text, (_, _, tgt_lang) in zip(pivot_texts, payloads)]
+        )
+
+    def pipelined_pivot_translate(self, payloads):
+        """
+        Translates indic-indic payloads via the pivot language with both legs running concurrently.
+
+        The first leg translates micro-batches of sentences in a background thread (CT2 releases the GIL)
+        and hands each finished micro-batch to the second leg through a queue. The pivot sentences are not
+        re-split, and when both models share the pivot SPM vocabulary, sentences without placeholders skip
+        the pivot postprocessing and preprocessing and go to the second leg as raw SPM tokens.
+        """
+        first_model = self.get_model("hi", self.pivot_lang)
+        second_model = self.get_model(self.pivot_lang, "hi")
+        pivot_lang = iso_to_flores[self.pivot_lang]
+        spm_passthrough = PIVOT_SPM_PASSTHROUGH and (
+            first_model.sp_tgt.serialized_model_proto() == second_model.sp_src.serialized_model_proto()
+        )
+
+        # sentences of all paragraphs as (paragraph_id, sentence_id, sentence, src_lang, tgt_lang), grouped by source language
+        translated_sents = []
+        sentences = []
+        for paragraph_id, (text, src_lang, tgt_lang) in enumerate(payloads):
+            src_lang, tgt_lang = iso_to_flores[src_lang], iso_to_flores[tgt_lang]
+            sents = split_sentences(text, src_lang)
+            translated_sents.append([""] * len(sents))
+            for sentence_id, sent in enumerate(sents):
+                sentences.append((paragraph_id, sentence_id, sent, src_lang, tgt_lang))
+        sentences.sort(key=lambda sentence: sentence[3])
+
+        micro_batches = []
+        for start in range(0, len(sentences), PIVOT_MICRO_BATCH_SIZE):
+            micro_batch = sentences[start:start + PIVOT_MICRO_BATCH_SIZE]
+            for src_lang in sorted({sentence[3] for sentence in micro_batch}):
+                micro_batches.append([sentence for sentence in micro_batch if sentence[3] == src_lang])
+
+        pivot_queue = queue.Queue()
+
+        def first_leg():
+            try:
+                for micro_batch in micro_batches:
+                    tagged_sents, placeholder_entity_map_sents = first_model.preprocess_batch(
+                        [sentence[2] for sentence in micro_batch], micro_batch[0][3], pivot_lang
+                    )
+                    raw_translations = first_model.chunked_translate_lines(tagged_sents)
+                    pivot_queue.put((micro_batch, raw_translations, placeholder_entity_map_sents))
+            except Exception as e:
+                pivot_queue.put(e)
+                return
+            pivot_queue.put(None)
+
+        first_leg_thread = threading.Thread(target=first_leg, daemon=True)
+        first_leg_thread.start()
+
+        while True:
+            item = pivot_queue.get()
+            if item is None:
+                break
+            if isinstance(item, Exception):
+                raise item
+            micro_batch, raw_translations, placeholder_entity_map_sents = item
+
+            for tgt_lang in sorted({sentence[4] for sentence in micro_batch}):
+                ids = [i for i, sentence in enumerate(micro_batch) if sentence[4] == tgt_lang]
+                tagged_sents = [None] * len(ids)
+                passthrough_ids = []
+                postprocess_ids = []
+                for j, i in enumerate(ids):
+                    if spm_passthrough and not placeholder_entity_map_sents[i]:
+                        tagged_sents[j] = [pivot_lang, tgt_lang] + raw_translations[i].split(" ")
+                        passthrough_ids.append(j)
+                    else:
+                        postprocess_ids.append(j)
+
+                second_placeholder_entity_maps = [{}] * len(ids)
+                if postprocess_ids:
+                    pivot_sents = first_model.postprocess(
+                        [raw_translations[ids[j]] for j in postprocess_ids],
+                        [placeholder_entity_map_sents[ids[j]] for j in postprocess_ids],
+                        pivot_lang,
+                    )
+                    pivot_tagged_sents, pivot_placeholder_entity_maps = second_model.preprocess_batch(
+                        pivot_sents, pivot_lang, tgt_lang
+                    )
+                    for j, tagged_sent, placeholder_entity_map in zip(
+                        postprocess_ids, pivot_tagged_sents, pivot_placeholder_entity_maps
+                    ):
+                        tagged_sents[j] = tagged_sent
+                        second_placeholder_entity_maps[j] = placeholder_entity_map
+
+                translations = second_model.postprocess(
+                    second_model.chunked_translate_lines(tagged_sents), second_placeholder_entity_maps, tgt_lang
+                )
+                for i, translation in zip(ids, translations):
+                    paragraph_id, sentence_id = micro_batch[i][:2]
+                    translated_sents[paragraph_id][sentence_id] = translation
+
+        first_leg_thread.join()
+        return [" ".join(sents) for sents in translated_sents]
+
+    def translate_direction_batch(self, direction_string, payloads):
+        if direction_string == "indic-indic" and self.pivot_lang:
+            if PIPELINED_PIVOTING:
+                return self.pipelined_pivot_translate(payloads)
+            return self.pivot_translate(payloads)
+        return self.models[direction_string].paragraphs_batch_translate__multilingual(payloads)
+
     def execute(self,requests):
         # print("REQ_COUNT", len(requests))
         modelwise_batches = {}
@@ -97,28 +234,23 @@ class TritonPythonModel:
                 modelwise_batches[direction_string]["payloads"].append([input_text, input_language_id, output_language_id])
                 modelwise_batches[direction_string]["text_id_to_req_id_input_id"].append((request_id, input_id))
 
+        # CT2 releases the GIL while decoding, so direction groups translate in parallel threads
+        if self.direction_executor is not None and len(modelwise_batches) > 1:
+            direction_futures = {
+                direction_string: self.direction_executor.submit(self.translate_direction_batch, direction_string, batch["payloads"])
+                for direction_string, batch in modelwise_batches.items()
+            }
+            direction_translations = {
+                direction_string: future.result() for direction_string, future in direction_futures.items()
+            }
+        else:
+            direction_translations = {
+                direction_string: self.translate_direction_batch(direction_string, batch["payloads"])
+                for direction_string, batch in modelwise_batches.items()
+            }
+
         for direction_string, batch in modelwise_batches.items():
-            if direction_string == "indic-indic" and self.pivot_lang:
-                model = self.get_model("hi", self.pivot_lang)
-                original_langs = []
-                for i in range(len(batch["payloads"])):
-                    original_langs.append(batch["payloads"][i][2])
-                    batch["payloads"][i][2] = self.pivot_lang
-
-                pivot_texts = model.paragraphs_batch_translate__multilingual(batch["payloads"])
-
-                for i in range(len(batch["payloads"])):
-                    batch["payloads"][i][0] = pivot_texts[i]
-                    batch["payloads"][i][1] = self.pivot_lang
-                    batch["payloads"][i][2] = original_langs[i]
-                
-                model = self.get_model(self.pivot_lang, "hi")
-                translations = model.paragraphs_batch_translate__multilingual(batch["payloads"])
-            else:
-                model = self.models[direction_string]
-                translations = model.paragraphs_batch_translate__multilingual(batch["payloads"])
-                # translations = ["bro"] * len(batch["payloads"])
-            
+            translations = direction_translations[direction_string]
             for translation, (request_id, output_id) in zip(translations, batch["text_id_to_req_id_input_id"]):
                 responses[request_id][output_id] = [translation]
         
@@ -4,27 +4,43 @@ Simple FastAPI inference server for IndicTrans2 translation.
 Provides a REST API endpoint compatible with the Pet Roast backend.
 """
 
+import gc
+import json
 import os
 import sys
-from typing import Optional
+import threading
+import time
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 
 import torch  # type: ignore
 import uvicorn
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel, Field
 
 # Add IndicTrans2 directories to path
 SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, SCRIPT_DIR)
 sys.path.insert(0, os.path.join(SCRIPT_DIR, "huggingface_interface"))
 
 # Import IndicTrans2 components
 try:
-    from transformers import AutoModelForSeq2SeqLM, AutoTokenizer  # type: ignore[import-untyped]
+    from transformers import AutoTokenizer  # type: ignore[import-untyped]
     from IndicTransToolkit.processor import IndicProcessor  # type: ignore[import-not-found]
 except ImportError:
     print("ERROR: Required packages not installed. Run: pip install IndicTransToolkit")
     sys.exit(1)
 
+from inference.engine import DECODING_PROFILES, DEFAULT_DECODING_PROFILE, split_sentences
+from inference.model_manager import ModelManager
+from inference.stage_timers import StageTimers, format_stage_timings
+from huggingface_interface.modeling_indictrans import (
+    IndicTransForConditionalGeneration,
+    compile_encoder_decoder_layers,
+    find_shared_source_groups,
+    quantize_dynamic_int8,
+)
+
 
 # Language code mapping (simplified for common Indian languages)
 ISO_TO_FLORES = {
@@ -49,6 +65,10 @@ class TranslateRequest(BaseModel):
     input: str = Field(..., description="Text to translate")
     source_language: str = Field("auto", description="Source language ISO code (e.g., 'hi', 'en')")
     target_language: str = Field("en", description="Target language ISO code")
+    decoding_profile: str = Field(
+        DEFAULT_DECODING_PROFILE,
+        description=f"Decoding profile, one of: {', '.join(DECODING_PROFILES)}",
+    )
 
 
 class TranslateResponse(BaseModel):
@@ -57,108 +77,526 @@ class TranslateResponse(BaseModel):
     target_language: str = Field(..., description="Target language")
 
 
-# Global model and processor
-model = None
-tokenizer = None
+class MultiTranslateRequest(BaseModel):
+    input: str = Field(..., description="Text to translate")
+    source_language: str = Field("auto", description="Source language ISO code (e.g., 'hi', 'en')")
+    target_languages: List[str] = Field(..., min_length=1, description="Target language ISO codes")
+    decoding_profile: str = Field(
+        DEFAULT_DECODING_PROFILE,
+        description=f"Decoding profile, one of: {', '.join(DECODING_PROFILES)}",
+    )
+
+
+class MultiTranslateResponse(BaseModel):
+    outputs: Dict[str, str] = Field(..., description="Translated text per target language")
+    source_language: str = Field(..., description="Detected or specified source language")
+    batching: Dict[str, int] = Field(
+        ...,
+        description="Generate calls and encoder rows, batched versus translating each target separately",
+    )
+
+
+# HuggingFace checkpoints for each translation direction. Every direction can be
+# overridden through the environment, e.g. to swap in the 1B models.
+DIRECTION_CHECKPOINTS = {
+    "en-indic": os.getenv("INDICTRANS_EN_INDIC_MODEL", "ai4bharat/indictrans2-en-indic-dist-200M"),
+    "indic-en": os.getenv("INDICTRANS_INDIC_EN_MODEL", "ai4bharat/indictrans2-indic-en-dist-200M"),
+    "indic-indic": os.getenv("INDICTRANS_INDIC_INDIC_MODEL", "ai4bharat/indictrans2-indic-indic-dist-320M"),
+}
+
+# Directions offered by the server (comma separated). Add "indic-indic" to avoid
+# pivoting through English for Indic -> Indic requests.
+ENABLED_DIRECTIONS = [
+    direction.strip()
+    for direction in os.getenv("INDICTRANS_DIRECTIONS", "en-indic,indic-en").split(",")
+    if direction.strip()
+]
+
+# Residency limits: at most MAX_RESIDENT_MODELS checkpoints are kept in memory,
+# the least-recently-used unpinned one is evicted when another is needed.
+# Directions that share a checkpoint share one resident model.
+# With LAZY_LOAD only pinned directions are loaded at startup.
+MAX_RESIDENT_MODELS = int(os.getenv(
+    "INDICTRANS_MAX_RESIDENT_MODELS",
+    str(len({DIRECTION_CHECKPOINTS.get(direction) for direction in ENABLED_DIRECTIONS}) or 1)
+))
+PINNED_DIRECTIONS = [
+    direction.strip()
+    for direction in os.getenv("INDICTRANS_PINNED_DIRECTIONS", "").split(",")
+    if direction.strip()
+]
+LAZY_LOAD = os.getenv("INDICTRANS_LAZY_LOAD", "false").lower() == "true"
+
+# CPU quantization of the direction models: "int8" applies dynamic int8
+# quantization to the Linear layers (ignored on CUDA)
+QUANTIZATION = os.getenv("INDICTRANS_QUANTIZATION", "").lower()
+
+# Attention implementation passed to from_pretrained ("eager", "sdpa" or
+# "flash_attention_2"); SDPA by default on CPU, the model default otherwise.
+# With TORCH_COMPILE the encoder and decoder layers are compiled and warmed up
+# with representative shapes when a model is loaded.
+ATTN_IMPLEMENTATION = os.getenv(
+    "INDICTRANS_ATTN_IMPLEMENTATION", "" if torch.cuda.is_available() else "sdpa"  # type: ignore
+)
+TORCH_COMPILE = os.getenv("INDICTRANS_TORCH_COMPILE", "false").lower() == "true"
+# Preallocate the decoder self-attention caches of each generate call for its
+# max_length and write them in place instead of growing them with torch.cat at
+# every step; on by default on CPU (the cache views are non-contiguous, which
+# some CUDA SDPA backends do not handle with attention masks).
+STATIC_KV_CACHE = os.getenv(
+    "INDICTRANS_STATIC_KV_CACHE", "false" if torch.cuda.is_available() else "true"  # type: ignore
+).lower() == "true"
+WARM_UP_BATCH_SIZES = [1, 4]
+WARM_UP_TEXTS = {
+    "eng_Latn": [
+        "Good morning!",
+        "Your dog looks like it just lost an argument with a vacuum cleaner.",
+        "This majestic creature spends its entire day guarding the sofa from imaginary "
+        "intruders, demanding treats on an hourly schedule and shedding on every freshly "
+        "washed piece of clothing.",
+    ],
+    "hin_Deva": [
+        "सुप्रभात!",
+        "तुम्हारा कुत्ता ऐसा लग रहा है जैसे वह अभी वैक्यूम क्लीनर से बहस हार गया हो।",
+        "यह शानदार जीव पूरा दिन सोफे को काल्पनिक घुसपैठियों से बचाने में बिताता है, हर घंटे "
+        "दावत की मांग करता है और हर धुले हुए कपड़े पर बाल छोड़ देता है।",
+    ],
+}
+WARM_UP_LANGS = {
+    "en-indic": ("eng_Latn", "hin_Deva"),
+    "indic-en": ("hin_Deva", "eng_Latn"),
+    "indic-indic": ("hin_Deva", "tam_Taml"),
+}
+
+# Sentences translated together per streamed chunk on /translate/stream
+STREAM_MICRO_BATCH_SIZE = int(os.getenv("INDICTRANS_STREAM_MICRO_BATCH_SIZE", "4"))
+
+PIVOT_LANG = "eng_Latn"
+
+# Per-stage, per-language timing of the translation pipeline, reported on
+# /metrics. Requests sent with `X-Debug-Timings: 1` get their own breakdown in
+# the `X-Stage-Timings` response header (streamed responses only include the
+# stages that ran before the stream started).
+STAGE_TIMING = os.getenv("INDICTRANS_STAGE_TIMING", "true").lower() == "true"
+stage_timers = StageTimers(enabled=STAGE_TIMING)
+
+# Global model manager (keyed by checkpoint name) and the startup processor
+model_manager: Optional[ModelManager] = None
+tokenizers: Dict[str, Any] = {}
 ip = None
+# IndicProcessor keeps the placeholder maps of preprocessed sentences in a FIFO
+# queue until they are postprocessed, so threads translating concurrently (the
+# event loop and the threadpool serving streams) each get their own instance
+processors = threading.local()
 DEVICE = "cuda" if torch.cuda.is_available() else "cpu"  # type: ignore
 
 
-def load_model():
-    """Load IndicTrans2 model on server startup."""
-    global model, tokenizer, ip
+def get_processor() -> Any:
+    """Return the IndicProcessor of the calling thread, creating it on first use."""
+    processor = getattr(processors, "ip", None)
+    if processor is None:
+        processor = processors.ip = IndicProcessor(inference=True)  # type: ignore
+    return processor
 
-    print(f"Loading IndicTrans2 model on {DEVICE}...")
 
-    # Use the smaller distilled model for faster inference
-    # For Indic -> English translation
-    model_name = "ai4bharat/indictrans2-indic-en-dist-200M"
+def get_tokenizer(direction: str) -> Any:
+    """
+    Return the tokenizer for a direction.
 
-    try:
-        print("Downloading/loading tokenizer...")
-        tokenizer = AutoTokenizer.from_pretrained(  # type: ignore
+    Tokenizers are small, so they are cached per checkpoint and never evicted;
+    directions pointing at the same checkpoint share a single instance.
+    """
+    model_name = DIRECTION_CHECKPOINTS[direction]
+    if model_name not in tokenizers:
+        print(f"[{direction}] Downloading/loading tokenizer {model_name}...")
+        tokenizers[model_name] = AutoTokenizer.from_pretrained(  # type: ignore
             model_name,
             trust_remote_code=True,
             token=False  # Use public model without authentication
         )
+    return tokenizers[model_name]
+
+
+def get_checkpoint_directions(model_name: str) -> List[str]:
+    """Return the enabled directions served by a checkpoint."""
+    return [direction for direction in ENABLED_DIRECTIONS if DIRECTION_CHECKPOINTS[direction] == model_name]
 
-        print("Downloading/loading model (this may take several minutes on first run)...")
-        model = AutoModelForSeq2SeqLM.from_pretrained(  # type: ignore
+
+def get_direction_model(direction: str) -> Any:
+    """Return the model of a direction, loading its checkpoint if required."""
+    return model_manager.get(DIRECTION_CHECKPOINTS[direction])  # type: ignore[union-attr]
+
+
+def load_checkpoint_model(model_name: str) -> Any:
+    """Load the model of a checkpoint once for all its directions (called by the model manager)."""
+    directions = get_checkpoint_directions(model_name)
+    direction = ",".join(directions)
+    print(f"[{direction}] Downloading/loading model {model_name} (this may take several minutes on first run)...")
+    load_kwargs: Dict[str, Any] = {}
+    if ATTN_IMPLEMENTATION:
+        load_kwargs["attn_implementation"] = ATTN_IMPLEMENTATION
+    # The weights are loaded into the local modeling class rather than the hub
+    # remote code, so the attention implementations and layer compilation of
+    # huggingface_interface/modeling_indictrans.py apply
+    try:
+        model = IndicTransForConditionalGeneration.from_pretrained(  # type: ignore
             model_name,
-            trust_remote_code=True,
             token=False,  # Use public model without authentication
+            torch_dtype=torch.float16 if DEVICE == "cuda" else torch.float32,  # type: ignore
+            **load_kwargs
+        ).to(DEVICE)  # type: ignore
+    except ValueError as e:
+        if not load_kwargs:
+            raise
+        print(f"[{direction}] attn_implementation={ATTN_IMPLEMENTATION} not supported ({e}), using the model default")
+        model = IndicTransForConditionalGeneration.from_pretrained(  # type: ignore
+            model_name,
+            token=False,
             torch_dtype=torch.float16 if DEVICE == "cuda" else torch.float32  # type: ignore
         ).to(DEVICE)  # type: ignore
+    model.eval()  # type: ignore
+    if STATIC_KV_CACHE:
+        model.enable_static_cache()
+    if QUANTIZATION == "int8" and DEVICE == "cpu":
+        model = quantize_dynamic_int8(model)
+        print(f"[{direction}] Applied dynamic int8 quantization to Linear layers")
+    if TORCH_COMPILE:
+        compile_encoder_decoder_layers(model, dynamic=True)
+        warm_up_model(directions[0], model)
+    return model
+
+
+def warm_up_model(direction: str, model: Any) -> None:
+    """
+    Run generate on short, medium and long inputs at a few batch sizes so that
+    compilation happens at load time rather than on the first requests.
+    """
+    src_lang, tgt_lang = WARM_UP_LANGS[direction]
+    tokenizer = get_tokenizer(direction)
+    start_time = time.perf_counter()
+    for batch_size in WARM_UP_BATCH_SIZES:
+        for text in WARM_UP_TEXTS[src_lang]:
+            # model inputs are prefixed with the language tags, as IndicProcessor does
+            inputs = tokenizer(  # type: ignore
+                [f"{src_lang} {tgt_lang} {text}"] * batch_size,
+                padding="longest",
+                return_tensors="pt",
+                return_attention_mask=True,
+            ).to(DEVICE)  # type: ignore
+            with torch.no_grad():  # type: ignore
+                model.generate(**inputs, use_cache=True, max_length=64, num_beams=5)  # type: ignore
+    print(f"[{direction}] Warmed up compiled model in {time.perf_counter() - start_time:.1f}s")
+
+
+def unload_checkpoint_model(model_name: str, model: Any) -> None:
+    """Release memory held by an evicted checkpoint model."""
+    print(f"[{','.join(get_checkpoint_directions(model_name))}] Evicting model {model_name} from memory")
+    del model
+    gc.collect()
+    if DEVICE == "cuda":
+        torch.cuda.empty_cache()  # type: ignore
 
+
+def load_model():
+    """Set up the direction model manager and preload models on server startup."""
+    global ip, model_manager
+
+    for direction in ENABLED_DIRECTIONS + PINNED_DIRECTIONS:
+        if direction not in DIRECTION_CHECKPOINTS or direction not in ENABLED_DIRECTIONS:
+            print(f"❌ Unknown or disabled translation direction: {direction}")
+            sys.exit(1)
+
+    model_manager = ModelManager(
+        loader=load_checkpoint_model,
+        max_resident=MAX_RESIDENT_MODELS,
+        pinned=[DIRECTION_CHECKPOINTS[direction] for direction in PINNED_DIRECTIONS],
+        unloader=unload_checkpoint_model,
+    )
+
+    pinned_checkpoints = list(model_manager.pinned)
+    if LAZY_LOAD:
+        preload_checkpoints = pinned_checkpoints
+    else:
+        preload_checkpoints = list(dict.fromkeys(pinned_checkpoints + [
+            DIRECTION_CHECKPOINTS[direction] for direction in ENABLED_DIRECTIONS
+        ]))[:max(MAX_RESIDENT_MODELS, len(pinned_checkpoints))]
+
+    print(
+        f"Serving IndicTrans2 directions on {DEVICE}: {', '.join(ENABLED_DIRECTIONS)} "
+        f"(max resident: {MAX_RESIDENT_MODELS}, preloading: {', '.join(preload_checkpoints) or 'none'})"
+    )
+
+    try:
+        for direction in ENABLED_DIRECTIONS:
+            get_tokenizer(direction)
+        model_manager.preload(preload_checkpoints)
+
+        # IndicProcessor is direction agnostic, one instance per thread serves every model
         print("Initializing IndicProcessor...")
-        ip = IndicProcessor(inference=True)  # type: ignore
-        print(f"✅ Model loaded successfully on {DEVICE}")
+        ip = get_processor()
+        print(f"✅ Models loaded successfully on {DEVICE}")
+        if get_pivot_lang():
+            print("ℹ️  No indic-indic model enabled, Indic -> Indic requests pivot through English")
 
     except Exception as e:
         print(f"❌ Error loading model: {e}")
         print("\nTroubleshooting:")
         print("1. Make sure you have internet connection for first-time model download")
-        print("2. The model is ~800MB and may take time to download")
-        print("3. Check if you have enough disk space (~2GB free)")
+        print("2. Each distilled model is ~800MB and may take time to download")
+        print("3. Check if you have enough disk space (~2GB free per model)")
         print(f"4. Model cache location: {os.path.expanduser('~/.cache/huggingface/')}")
         sys.exit(1)
-def translate_text(text: str, src_lang: str, tgt_lang: str) -> str:
+
+
+def is_indic_language(lang: str) -> bool:
+    """Return True for any FLORES code other than the English pivot."""
+    return lang != PIVOT_LANG and "_" in lang
+
+
+def detect_language(text: str) -> str:
     """
-    Translate text using IndicTrans2.
+    Very small script-based language guess used for `auto` source language.
 
-    Args:
-        text: Input text to translate
-        src_lang: Source language (ISO code or FLORES code)
-        tgt_lang: Target language (ISO code or FLORES code)
+    Text written entirely in Latin script is treated as English, everything
+    else defaults to Hindi.
+    """
+    letters = [ch for ch in text if ch.isalpha()]
+    if letters and all(ch.isascii() for ch in letters):
+        return PIVOT_LANG
+    return "hin_Deva"
+
+
+def get_direction_string(src_lang: str, tgt_lang: str) -> Optional[str]:
+    """Map a FLORES language pair to the direction model that serves it."""
+    if src_lang == PIVOT_LANG and is_indic_language(tgt_lang):
+        return "en-indic"
+    if is_indic_language(src_lang):
+        if tgt_lang == PIVOT_LANG:
+            return "indic-en"
+        if is_indic_language(tgt_lang):
+            return "indic-indic"
+    return None
+
+
+def get_pivot_lang() -> Optional[str]:
+    """Return the pivot language if Indic -> Indic must go through English."""
+    if (
+        "indic-indic" not in ENABLED_DIRECTIONS
+        and "en-indic" in ENABLED_DIRECTIONS
+        and "indic-en" in ENABLED_DIRECTIONS
+    ):
+        return PIVOT_LANG
+    return None
+
+
+def check_decoding_profile(decoding_profile: str) -> None:
+    if decoding_profile not in DECODING_PROFILES:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unknown decoding profile: {decoding_profile}, expected one of {', '.join(DECODING_PROFILES)}"
+        )
+
+
+def generate_translations(
+    texts: List[str],
+    src_lang: str,
+    tgt_lang: str,
+    direction: str,
+    decoding_profile: str = DEFAULT_DECODING_PROFILE
+) -> List[str]:
+    """Run a batch of texts through a single direction model."""
+    processor = get_processor()
+
+    # Preprocess
+    with stage_timers.time("preprocess", src_lang, len(texts)):
+        batch = processor.preprocess_batch(texts, src_lang, tgt_lang)
+
+    # Tokenize, generate and decode
+    with stage_timers.time("spm", src_lang, len(texts)):
+        inputs = tokenize_batch(batch, direction)
+    # resolved outside the decode timer: a lazy load or reload is reported as its own stage
+    with stage_timers.time("load", src_lang):
+        model = get_direction_model(direction)
+    with stage_timers.time("decode", src_lang, len(texts)):
+        generated_tokens = generate_tokens(inputs, model, direction, decoding_profile)
+
+    # Postprocess
+    with stage_timers.time("postprocess", tgt_lang, len(texts)):
+        return processor.postprocess_batch(generated_tokens, lang=tgt_lang)
+
+
+def generate_multi_target_translations(
+    texts: List[str],
+    src_lang: str,
+    tgt_langs: List[str],
+    direction: str,
+    decoding_profile: str = DEFAULT_DECODING_PROFILE
+) -> Tuple[Dict[str, List[str]], int]:
+    """
+    Translate a batch of texts into several target languages of one direction
+    with a single generate call.
+
+    The target tag is part of the encoder input, so every target still gets its
+    own encoder rows, but all targets share one batched encoder pass and one
+    decoding loop instead of one generate call each.
 
     Returns:
-        Translated text
+        Translations per target language and the number of sources whose rows
+        were detected as sharing the same tokens apart from the target tag.
+    """
+    # IndicProcessor queues placeholder maps per preprocessed sentence, so
+    # preprocess once per target to keep postprocessing aligned
+    processor = get_processor()
+    batch = []
+    with stage_timers.time("preprocess", src_lang, len(texts) * len(tgt_langs)):
+        for tgt_lang in tgt_langs:
+            batch.extend(processor.preprocess_batch(texts, src_lang, tgt_lang))
+
+    with stage_timers.time("spm", src_lang, len(batch)):
+        inputs = tokenize_batch(batch, direction)
+    shared_sources = sum(
+        1 for group in find_shared_source_groups(inputs["input_ids"], inputs["attention_mask"])
+        if len(group) > 1
+    )
+    with stage_timers.time("load", src_lang):
+        model = get_direction_model(direction)
+    with stage_timers.time("decode", src_lang, len(batch)):
+        generated_tokens = generate_tokens(inputs, model, direction, decoding_profile)
+
+    translations = {}
+    for i, tgt_lang in enumerate(tgt_langs):
+        with stage_timers.time("postprocess", tgt_lang, len(texts)):
+            translations[tgt_lang] = processor.postprocess_batch(
+                generated_tokens[i * len(texts):(i + 1) * len(texts)], lang=tgt_lang
+            )
+    return translations, shared_sources
+
+
+def tokenize_batch(batch: List[str], direction: str) -> Any:
+    """Tokenize preprocessed sentences for a direction model."""
+    tokenizer = get_tokenizer(direction)
+    return tokenizer(  # type: ignore
+        batch,
+        truncation=True,
+        padding="longest",
+        return_tensors="pt",
+        return_attention_mask=True,
+    ).to(DEVICE)  # type: ignore
+
+
+def generate_tokens(
+    inputs: Any,
+    model: Any,
+    direction: str,
+    decoding_profile: str = DEFAULT_DECODING_PROFILE
+) -> List[str]:
     """
-    # Convert ISO codes to FLORES codes if needed
+    Generate and decode translations for tokenized inputs with a direction model.
+
+    The model is resolved by the caller (see `get_direction_model`), so loading
+    it is not part of the generation. The beam size comes from the decoding
+    profile and the generation budget scales with the longest tokenized input
+    instead of a fixed 256 tokens.
+    """
+    profile = DECODING_PROFILES[decoding_profile]
+    tokenizer = get_tokenizer(direction)
+
+    max_length = min(256, int(profile.length_ratio * inputs["input_ids"].shape[1]) + profile.length_margin)
+
+    # Generate translation
+    with torch.no_grad():  # type: ignore
+        generated_tokens = model.generate(  # type: ignore
+            **inputs,
+            use_cache=True,
+            min_length=0,
+            max_length=max_length,
+            num_beams=profile.beam_size,
+            num_return_sequences=1,
+        )
+
+    # Decode
+    with tokenizer.as_target_tokenizer():  # type: ignore
+        return tokenizer.batch_decode(  # type: ignore
+            generated_tokens.detach().cpu().tolist(),  # type: ignore
+            skip_special_tokens=True,
+            clean_up_tokenization_spaces=True,
+        )
+
+
+def resolve_languages(text: str, src_lang: str, tgt_lang: str) -> Tuple[str, str]:
+    """Convert ISO codes to FLORES codes and resolve `auto` source language."""
     if src_lang in ISO_TO_FLORES:
         src_lang = ISO_TO_FLORES[src_lang]
     if tgt_lang in ISO_TO_FLORES:
         tgt_lang = ISO_TO_FLORES[tgt_lang]
 
-    # For auto-detection, assume Hindi if not English
     if src_lang == "auto":
-        src_lang = "hin_Deva"  # Default to Hindi for Indian languages
+        src_lang = detect_language(text)
 
-    try:
-        # Preprocess
-        batch = ip.preprocess_batch([text], src_lang, tgt_lang)  # type: ignore
-
-        # Tokenize
-        inputs = tokenizer(  # type: ignore
-            batch,
-            truncation=True,
-            padding="longest",
-            return_tensors="pt",
-            return_attention_mask=True,
-        ).to(DEVICE)  # type: ignore
+    return src_lang, tgt_lang
 
-        # Generate translation
-        with torch.no_grad():  # type: ignore
-            generated_tokens = model.generate(  # type: ignore
-                **inputs,
-                use_cache=True,
-                min_length=0,
-                max_length=256,
-                num_beams=5,
-                num_return_sequences=1,
-            )
 
-        # Decode
-        with tokenizer.as_target_tokenizer():  # type: ignore
-            generated_tokens = tokenizer.batch_decode(  # type: ignore
-                generated_tokens.detach().cpu().tolist(),  # type: ignore
-                skip_special_tokens=True,
-                clean_up_tokenization_spaces=True,
-            )
+def get_translation_legs(src_lang: str, tgt_lang: str) -> List[Tuple[str, str, str]]:
+    """
+    Plan the model calls for a FLORES language pair.
+
+    Returns a list of (src_lang, tgt_lang, direction) legs: none when source and
+    target match, one for a served direction and two when Indic -> Indic pivots
+    through English.
+    """
+    if src_lang == tgt_lang:
+        return []
+
+    direction = get_direction_string(src_lang, tgt_lang)
+    if direction in ENABLED_DIRECTIONS:
+        return [(src_lang, tgt_lang, direction)]  # type: ignore[list-item]
+
+    pivot_lang = get_pivot_lang()
+    if direction == "indic-indic" and pivot_lang:
+        return [(src_lang, pivot_lang, "indic-en"), (pivot_lang, tgt_lang, "en-indic")]
+
+    raise HTTPException(status_code=400, detail=f"Language-pair not supported: {src_lang}-{tgt_lang}")
+
+
+def run_translation_legs(
+    texts: List[str],
+    legs: List[Tuple[str, str, str]],
+    decoding_profile: str = DEFAULT_DECODING_PROFILE
+) -> List[str]:
+    """Pass a batch of texts through each planned leg in turn."""
+    for src_lang, tgt_lang, direction in legs:
+        texts = generate_translations(texts, src_lang, tgt_lang, direction, decoding_profile)
+    return texts
+
+
+def translate_text(
+    text: str,
+    src_lang: str,
+    tgt_lang: str,
+    decoding_profile: str = DEFAULT_DECODING_PROFILE
+) -> str:
+    """
+    Translate text using IndicTrans2.
+
+    The request is routed to the en-indic, indic-en or indic-indic model based
+    on the language pair. Indic -> Indic requests pivot through English when no
+    indic-indic model is loaded.
+
+    Args:
+        text: Input text to translate
+        src_lang: Source language (ISO code or FLORES code)
+        tgt_lang: Target language (ISO code or FLORES code)
+        decoding_profile: Name of the decoding profile (fast, balanced or quality)
 
-        # Postprocess
-        translations = ip.postprocess_batch(generated_tokens, lang=tgt_lang)  # type: ignore
+    Returns:
+        Translated text
+    """
+    check_decoding_profile(decoding_profile)
+    src_lang, tgt_lang = resolve_languages(text, src_lang, tgt_lang)
+    legs = get_translation_legs(src_lang, tgt_lang)
 
+    try:
+        translations = run_translation_legs([text], legs, decoding_profile)
         return translations[0] if translations else text
 
     except Exception as e:
@@ -166,6 +604,129 @@ def translate_text(text: str, src_lang: str, tgt_lang: str) -> str:
         raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
 
 
+def stream_translation(
+    text: str,
+    src_lang: str,
+    tgt_lang: str,
+    decoding_profile: str = DEFAULT_DECODING_PROFILE
+) -> Iterator[str]:
+    """
+    Translate text sentence by sentence as Server-Sent Events.
+
+    The text is split into sentences which are translated in micro-batches of
+    STREAM_MICRO_BATCH_SIZE; each translated sentence is sent as a `data` event
+    as soon as its micro-batch finishes, followed by a final `done` event. The
+    language pair and decoding profile are validated before the stream starts.
+    """
+    check_decoding_profile(decoding_profile)
+    src_lang, tgt_lang = resolve_languages(text, src_lang, tgt_lang)
+    legs = get_translation_legs(src_lang, tgt_lang)
+    with stage_timers.time("split", src_lang):
+        sentences = split_sentences(text, src_lang) if legs else [text]
+
+    def events() -> Iterator[str]:
+        index = 0
+        try:
+            for start in range(0, len(sentences), STREAM_MICRO_BATCH_SIZE):
+                micro_batch = sentences[start:start + STREAM_MICRO_BATCH_SIZE]
+                for translation in run_translation_legs(micro_batch, legs, decoding_profile):
+                    yield f"data: {json.dumps({'index': index, 'output': translation}, ensure_ascii=False)}\n\n"
+                    index += 1
+            yield f"event: done\ndata: {json.dumps({'sentences': index})}\n\n"
+        except Exception as e:
+            print(f"Translation error: {e}")
+            yield f"event: error\ndata: {json.dumps({'detail': f'Translation failed: {str(e)}'})}\n\n"
+
+    return events()
+
+
+def translate_multi_target(
+    text: str,
+    src_lang: str,
+    tgt_langs: List[str],
+    decoding_profile: str = DEFAULT_DECODING_PROFILE
+) -> Tuple[Dict[str, str], str, Dict[str, int]]:
+    """
+    Translate one text into several target languages.
+
+    Targets served by the same direction model are translated in one batched
+    generate call, and Indic -> Indic targets that pivot through English share a
+    single translation into English.
+
+    Every target keeps its own encoder row, as its tag is part of the encoder
+    input, so batching saves generate calls rather than encoder work; only the
+    shared pivot leg saves rows.
+
+    Returns:
+        Translation per requested target code, the resolved source language and
+        the generate calls and encoder rows used compared to one request per
+        target.
+    """
+    check_decoding_profile(decoding_profile)
+    src_lang, _ = resolve_languages(text, src_lang, tgt_langs[0])
+
+    outputs: Dict[str, str] = {}
+    direct_targets: Dict[str, List[str]] = {}
+    pivot_targets: List[str] = []
+    requested = {}
+    sequential_calls = 0
+    for requested_lang in dict.fromkeys(tgt_langs):
+        _, tgt_lang = resolve_languages(text, src_lang, requested_lang)
+        requested[requested_lang] = tgt_lang
+        legs = get_translation_legs(src_lang, tgt_lang)
+        sequential_calls += len(legs)
+        if len(legs) == 1:
+            direct_targets.setdefault(legs[0][2], []).append(tgt_lang)
+        elif legs:
+            pivot_targets.append(tgt_lang)
+
+    pivot_lang = get_pivot_lang()
+    if pivot_targets and pivot_lang not in direct_targets.get("indic-en", []):
+        direct_targets.setdefault("indic-en", []).append(pivot_lang)  # type: ignore[arg-type]
+
+    translations: Dict[str, str] = {src_lang: text}
+    generate_calls = 0
+    encoder_rows = 0
+    shared_sources = 0
+    try:
+        for direction, direction_tgt_langs in direct_targets.items():
+            direction_translations, shared = generate_multi_target_translations(
+                [text], src_lang, direction_tgt_langs, direction, decoding_profile
+            )
+            generate_calls += 1
+            encoder_rows += len(direction_tgt_langs)
+            shared_sources += shared
+            translations.update({lang: sents[0] for lang, sents in direction_translations.items()})
+
+        if pivot_targets:
+            direction_translations, shared = generate_multi_target_translations(
+                [translations[pivot_lang]], pivot_lang, pivot_targets, "en-indic", decoding_profile  # type: ignore[index]
+            )
+            generate_calls += 1
+            encoder_rows += len(pivot_targets)
+            shared_sources += shared
+            translations.update({lang: sents[0] for lang, sents in direction_translations.items()})
+
+    except Exception as e:
+        print(f"Translation error: {e}")
+        raise HTTPException(status_code=500, detail=f"Translation failed: {str(e)}")
+
+    for requested_lang, tgt_lang in requested.items():
+        outputs[requested_lang] = translations[tgt_lang]
+
+    # a request per target runs one generate call, on one encoder row, per leg
+    batching = {
+        "targets": len(requested),
+        "generate_calls": generate_calls,
+        "sequential_generate_calls": sequential_calls,
+        "encoder_rows": encoder_rows,
+        "sequential_encoder_rows": sequential_calls,
+        # sources encoded once per target, differing only in the target tag
+        "shared_sources": shared_sources,
+    }
+    return outputs, src_lang, batching
+
+
 # Create FastAPI app
 app = FastAPI(
     title="IndicTrans2 Inference Server",
@@ -174,6 +735,18 @@ app = FastAPI(
 )
 
 
+@app.middleware("http")
+async def stage_timings_header(request: Request, call_next):
+    """Report the stage timings of a request when it asks for them."""
+    if not STAGE_TIMING or request.headers.get("x-debug-timings", "").lower() not in ("1", "true"):
+        return await call_next(request)
+
+    with stage_timers.collect() as timings:
+        response = await call_next(request)
+    response.headers["X-Stage-Timings"] = format_stage_timings(timings)
+    return response
+
+
 @app.on_event("startup")
 async def startup_event():
     """Load model on server startup."""
@@ -191,21 +764,24 @@ async def root():
     }
 
 
+# The translation handlers are plain functions so FastAPI runs them in its
+# threadpool; the blocking generate calls would otherwise stall the event loop
 @app.post("/translate", response_model=TranslateResponse)
-async def translate(request: TranslateRequest):
+def translate(request: TranslateRequest):
     """
     Translate text from source language to target language.
 
     Supported languages: hi, bn, gu, mr, kn, te, ml, ta, pa, or, as, ur, en
     """
-    if not model or not tokenizer:
+    if model_manager is None or ip is None:
         raise HTTPException(status_code=503, detail="Model not loaded yet")
 
     try:
         translated = translate_text(
             request.input,
             request.source_language,
-            request.target_language
+            request.target_language,
+            request.decoding_profile
         )
 
         return TranslateResponse(
@@ -219,17 +795,90 @@ async def translate(request: TranslateRequest):
         raise HTTPException(status_code=500, detail=str(e))
 
 
+@app.post("/translate/stream")
+def translate_stream(request: TranslateRequest):
+    """
+    Translate text and stream the translated sentences as Server-Sent Events.
+
+    Each `data` event carries `{"index": ..., "output": ...}` for one sentence,
+    in order; the stream ends with a `done` event (or an `error` event).
+    """
+    if model_manager is None or ip is None:
+        raise HTTPException(status_code=503, detail="Model not loaded yet")
+
+    events = stream_translation(
+        request.input,
+        request.source_language,
+        request.target_language,
+        request.decoding_profile
+    )
+    return StreamingResponse(events, media_type="text/event-stream")
+
+
+@app.post("/translate/multi", response_model=MultiTranslateResponse)
+def translate_multi(request: MultiTranslateRequest):
+    """
+    Translate one text into several target languages in batched model calls.
+
+    The response reports the generate calls made and encoder rows encoded
+    compared to translating each target language with a separate request.
+    """
+    if model_manager is None or ip is None:
+        raise HTTPException(status_code=503, detail="Model not loaded yet")
+
+    outputs, source_language, batching = translate_multi_target(
+        request.input,
+        request.source_language,
+        request.target_languages,
+        request.decoding_profile
+    )
+    return MultiTranslateResponse(outputs=outputs, source_language=source_language, batching=batching)
+
+
 @app.get("/health")
 async def health_check():
     """Detailed health check."""
     return {
         "status": "healthy",
-        "model_loaded": model is not None,
+        "model_loaded": ip is not None,
+        "directions": ENABLED_DIRECTIONS,
+        "resident_directions": [
+            direction for direction in ENABLED_DIRECTIONS
+            if model_manager.is_resident(DIRECTION_CHECKPOINTS[direction])
+        ] if model_manager else [],
+        "pivot_language": get_pivot_lang(),
         "device": DEVICE,
+        "quantization": QUANTIZATION if QUANTIZATION == "int8" and DEVICE == "cpu" else None,
+        "attn_implementation": ATTN_IMPLEMENTATION or None,
+        "torch_compile": TORCH_COMPILE,
+        "static_kv_cache": STATIC_KV_CACHE,
         "cuda_available": torch.cuda.is_available()
     }
 
 
+@app.get("/models")
+async def model_metrics():
+    """Model residency, hit/miss and load-time metrics per checkpoint."""
+    if model_manager is None:
+        raise HTTPException(status_code=503, detail="Model not loaded yet")
+    return model_manager.metrics()
+
+
+@app.get("/metrics")
+async def stage_metrics(lang: Optional[str] = None):
+    """
+    Cumulative pipeline stage timings per language.
+
+    Stages are split, preprocess (punctuation normalization, placeholders and
+    tokenization/transliteration in IndicProcessor), spm, load (resolving the
+    direction model, including lazy loads and reloads), decode and
+    postprocess; each reports calls, sentences, total/mean/max milliseconds and
+    its share of the language's total time. Pass `lang` (FLORES code) to only
+    get one language.
+    """
+    return {"enabled": STAGE_TIMING, "languages": stage_timers.snapshot(lang)}
+
+
 if __name__ == "__main__":
     print("=" * 60)
     print("IndicTrans2 Inference Server")
@@ -23,11 +23,30 @@ from indicnlp.normalize import indic_normalize
 from indicnlp.transliterate import unicode_transliterate
 
 import re
+from functools import lru_cache
 from typing import Union
 from flores_codes_map_indic import flores_codes
 
 en_tok = MosesTokenizer(lang="en")
 en_normalizer = MosesPunctNormalizer()
+normfactory = indic_normalize.IndicNormalizerFactory()
+
+DNT_PATTERN = re.compile(r'<dnt>(.*?)</dnt>')
+WHITESPACE_PATTERN = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=None)
+def get_normalizer(iso_lang: str) -> indic_normalize.BaseNormalizer:
+    """
+    Returns the Indic normalizer for a language, created once per process.
+
+    Args:
+        iso_lang (str): iso code of the language.
+
+    Returns:
+        indic_normalize.BaseNormalizer: the cached normalizer.
+    """
+    return normfactory.get_normalizer(iso_lang)
 
 
 def preprocess_line(
@@ -42,7 +61,8 @@ def preprocess_line(
 
     Args:
         line (str): the line of text to preprocess.
-        normalizer (Union[MosesPunctNormalizer, indic_normalize.IndicNormalizerFactory]): an object that performs normalization on the text.
+        normalizer (Union[MosesPunctNormalizer, indic_normalize.IndicNormalizerFactory]): an object that performs normalization on the text,
+            if None the cached normalizer of `lang` is used.
         lang (str): the language of the line of text
         transliterate (bool, optional): whether to transliterate the line of text to devanagari (default: False).
         remove_tag (bool, optional): whether to remove the do not translate tags (`<dnt>` and `</dnt>`) from the line of text (default: True).
@@ -51,9 +71,10 @@ def preprocess_line(
         str: preprocessed line of text.
     """
     iso_lang = flores_codes[lang]
+    if normalizer is None and iso_lang != "en":
+        normalizer = get_normalizer(iso_lang)
     
-    pattern = r'<dnt>(.*?)</dnt>'
-    raw_matches = re.findall(pattern, line)
+    raw_matches = DNT_PATTERN.findall(line)
 
     if iso_lang == "en":
         processed_line = " ".join(en_tok.tokenize(en_normalizer.normalize(line.strip()), escape=False))
@@ -75,13 +96,13 @@ def preprocess_line(
     processed_line = processed_line.replace("< dnt >", "<dnt>")
     processed_line = processed_line.replace("< / dnt >", "</dnt>")
     
-    processed_line_matches = re.findall(pattern, processed_line)
+    processed_line_matches = DNT_PATTERN.findall(processed_line)
     for raw_match, processed_line_match in zip(raw_matches, processed_line_matches):
         processed_line = processed_line.replace(processed_line_match, raw_match)
     
     if remove_tag:
-        processed_line = re.sub("\s+", " ", processed_line.replace("<dnt>", " ")).strip()
-        processed_line = re.sub("\s+", " ", processed_line.replace("</dnt>", " ")).strip()
+        processed_line = WHITESPACE_PATTERN.sub(" ", processed_line.replace("<dnt>", " ")).strip()
+        processed_line = WHITESPACE_PATTERN.sub(" ", processed_line.replace("</dnt>", " ")).strip()
     
     return processed_line
     
@@ -125,15 +146,15 @@ def preprocess(
                 outfile.write(line + "\n")
                 n += 1
     else:
-        normfactory = indic_normalize.IndicNormalizerFactory()
-        normalizer = normfactory.get_normalizer(iso_lang)
         # reading
         with open(infname, "r", encoding="utf-8") as infile, open(
             outfname, "w", encoding="utf-8"
         ) as outfile:
 
+            # the normalizer is resolved from the per-process cache inside each worker
+            # instead of being pickled along with every line
             out_lines = Parallel(n_jobs=-1, backend="multiprocessing")(
-                delayed(preprocess_line)(line, normalizer, lang, transliterate, remove_tag)
+                delayed(preprocess_line)(line, None, lang, transliterate, remove_tag)
                 for line in tqdm(infile, total=num_lines)
             )
 
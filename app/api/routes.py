@@ -2,9 +2,10 @@
 
 import asyncio
 import logging
+from datetime import datetime, timezone
 from typing import Any, Dict
 
-from fastapi import APIRouter, Depends, HTTPException, Request, Response, status
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, Response, status
 import httpx
 
 from app.clients.ai4bharat import AI4BharatClient
@@ -33,6 +34,8 @@ from app.schemas import (
     TranslateTextResponse,
     GenerateVideoRequest,
     GenerateVideoResponse,
+    JobListResponse,
+    JobSummary,
     RevidWebhookEvent,
     VideoResultResponse,
     VideoStatusResponse,
@@ -61,6 +64,23 @@ def _normalise_status(value: str) -> JobStatus:
     return normalised if normalised else JobStatus.PROCESSING
 
 
+def _has_status_changes(
+    record: JobRecord,
+    status_value: JobStatus,
+    detail: Optional[str],
+    video_url: Optional[str],
+) -> bool:
+    """Whether a polled fal.ai status differs from the stored record.
+
+    Mirrors `JobStore.update`, which leaves fields passed as None untouched.
+    """
+    return (
+        status_value != record.status
+        or (detail is not None and detail != record.detail)
+        or (video_url is not None and video_url != record.video_url)
+    )
+
+
 def _extract_translated_text(result: Dict[str, Any]) -> str:
     candidates = (
         result.get("translated_text"),
@@ -87,6 +107,7 @@ async def translate_text(
             source_language=payload.source_lang,
             target_language=payload.target_lang,
             task=payload.task,
+            decoding_profile=payload.decoding_profile,
         )
     except AI4BharatAPIError as exc:
         _logger.exception("AI4Bharat translation failed")
@@ -435,12 +456,16 @@ async def video_completion_webhook(
 
         _logger.info(f"📥 Webhook received for job {job_id}: status={status_str}")
 
-        # Update job status in store
-        stored_record = await job_store.get(job_id)
+        # Update job status in store, without re-reading and re-writing the
+        # stored image of image_data and video jobs
+        stored_record = await job_store.update(
+            job_id,
+            status=_normalise_status(status_str),
+            video_url=video_url or None,
+            detail=error or None,
+        )
         if stored_record:
-            stored_record.status = _normalise_status(status_str)
             if video_url:
-                stored_record.video_url = video_url
                 _logger.info(f"📹 Video URL for job {job_id}: {video_url}")
                 
                 # Download and save video to storage
@@ -456,9 +481,7 @@ async def video_completion_webhook(
                 except Exception as e:
                     _logger.error(f"❌ Error saving video for job {job_id}: {e}")
             if error:
-                stored_record.detail = error
                 _logger.error(f"❌ Job {job_id} failed: {error}")
-            await job_store.upsert(stored_record)
             _logger.info(f"✅ Updated job {job_id} in store: {status_str}")
         else:
             _logger.warning(f"⚠️  Job {job_id} not found in store, creating new record")
@@ -565,7 +588,7 @@ async def get_video_status(
 ) -> VideoStatusResponse:
     """Poll fal.ai for the latest job status."""
 
-    stored_record = await job_store.get(job_id)
+    stored_record = await job_store.get(job_id, include_image=False)
     try:
         remote_status = await fal_client.get_job_status(job_id)
         status_value = _normalise_status(remote_status.get("status", "processing"))
@@ -582,7 +605,9 @@ async def get_video_status(
                 video_url=video_url,
             )
             await job_store.upsert(stored_record)
-        else:
+        elif _has_status_changes(stored_record, status_value, detail, video_url):
+            # polls that change nothing skip the write, which would also
+            # invalidate the cached record on every replica
             stored_record = await job_store.update(
                 job_id,
                 status=status_value,
@@ -617,7 +642,7 @@ async def get_video_result(
 ) -> VideoResultResponse:
     """Retrieve final video URL once fal.ai completes the job."""
 
-    record = await job_store.get(job_id)
+    record = await job_store.get(job_id, include_image=False)
     if record is None:
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Job ID not found.")
 
@@ -627,12 +652,13 @@ async def get_video_result(
             status_value = _normalise_status(status_payload.get("status", record.status.value))
             detail = status_payload.get("detail")
             video_url = status_payload.get("video_url")
-            record = await job_store.update(
-                job_id,
-                status=status_value,
-                detail=detail,
-                video_url=video_url,
-            ) or record
+            if _has_status_changes(record, status_value, detail, video_url):
+                record = await job_store.update(
+                    job_id,
+                    status=status_value,
+                    detail=detail,
+                    video_url=video_url,
+                ) or record
         except FalAPIError as exc:
             _logger.exception("fal.ai status fetch during result retrieval failed")
             raise HTTPException(status_code=status.HTTP_502_BAD_GATEWAY, detail=str(exc)) from exc
@@ -691,6 +717,49 @@ async def get_video_result(
     )
 
 
+@router.get("/jobs", response_model=JobListResponse)
+async def list_jobs(
+    status_filter: Optional[JobStatus] = Query(None, alias="status"),
+    updated_before: Optional[datetime] = Query(
+        None, description="Only jobs last updated before this time, e.g. to find stale processing jobs."
+    ),
+    offset: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=500),
+    job_store: JobStore = Depends(get_job_store),
+) -> JobListResponse:
+    """List jobs by most recent update, optionally filtered by status."""
+
+    if updated_before is not None and updated_before.tzinfo is None:
+        # job timestamps are stored in UTC
+        updated_before = updated_before.replace(tzinfo=timezone.utc)
+
+    records, total = await job_store.list_jobs(
+        status=status_filter,
+        updated_before=updated_before,
+        offset=offset,
+        limit=limit,
+    )
+    next_offset = offset + limit if offset + limit < total else None
+    return JobListResponse(
+        jobs=[
+            JobSummary(
+                job_id=record.job_id,
+                status=record.status,
+                language=record.language,
+                video_url=record.video_url,
+                detail=record.detail,
+                created_at=record.created_at,
+                updated_at=record.updated_at,
+            )
+            for record in records
+        ],
+        total=total,
+        offset=offset,
+        limit=limit,
+        next_offset=next_offset,
+    )
+
+
 @router.get("/test-backend-connection")
 async def test_backend_connection(
     settings: Settings = Depends(get_settings_dependency),
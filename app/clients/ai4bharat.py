@@ -21,6 +21,7 @@ class AI4BharatClient:
         base_url: str,
         translate_path: str,
         api_key: Optional[str] = None,
+        decoding_profile: Optional[str] = None,
         max_retries: int = 3,
         retry_backoff_factor: float = 1.5,
     ) -> None:
@@ -28,6 +29,7 @@ class AI4BharatClient:
         self._base_url = base_url.rstrip("/")
         self._translate_path = translate_path
         self._api_key = api_key
+        self._decoding_profile = decoding_profile
         self._max_retries = max_retries
         self._retry_backoff_factor = retry_backoff_factor
 
@@ -44,12 +46,17 @@ class AI4BharatClient:
         source_language: Optional[str] = None,
         target_language: str = "en",
         task: str = "translation",
+        decoding_profile: Optional[str] = None,
     ) -> Dict[str, Any]:
         """Call IndicTrans2 (AI4Bharat) to translate Indian language text.
 
         IndicTrans2 supports: Hindi (hi), Bengali (bn), Gujarati (gu), Marathi (mr),
         Kannada (kn), Telugu (te), Malayalam (ml), Tamil (ta), Punjabi (pa), Odia (or),
         Assamese (as), Urdu (ur), and English (en).
+
+        ``decoding_profile`` trades quality for latency: ``fast`` (greedy),
+        ``balanced`` (beam 2) or ``quality`` (beam 5). It falls back to the
+        client default and then to the server default.
         """
 
         # IndicTrans2 API format
@@ -58,6 +65,9 @@ class AI4BharatClient:
             "source_language": source_language or "auto",
             "target_language": target_language,
         }
+        decoding_profile = decoding_profile or self._decoding_profile
+        if decoding_profile:
+            payload["decoding_profile"] = decoding_profile
         url = f"{self._base_url}{self._translate_path}"
 
         last_exception: Exception | None = None
@@ -74,12 +84,15 @@ class AI4BharatClient:
                 try:
                     result = response.json()
                     # Normalize IndicTrans2 response format to match expected interface
-                    return {
+                    normalized: Dict[str, Any] = {
                         "translated_text": result.get("output", result.get("translation", text)),
                         "source_language": source_language or result.get("detected_language", "auto"),
                         "target_language": target_language,
                         "task": task,
                     }
+                    if decoding_profile:
+                        normalized["decoding_profile"] = decoding_profile
+                    return normalized
                 except ValueError as exc:  # pragma: no cover - defensive guard
                     raise AI4BharatAPIError(
                         "AI4Bharat response was not valid JSON."
@@ -24,6 +24,8 @@ class Settings(BaseSettings):
     ai4bharat_base_url: str = "http://localhost:5000"
     ai4bharat_translate_path: str = "/translate"
     ai4bharat_api_key: Optional[str] = None
+    # Default decoding profile (fast, balanced or quality); None uses the server default
+    ai4bharat_decoding_profile: Optional[str] = None
 
     # pets-backend GraphQL server configuration
     pets_backend_url: str = "http://localhost:4000"  # GraphQL server URL
@@ -66,6 +68,7 @@ class Settings(BaseSettings):
     redis_url: str = "redis://localhost:6379/0"
     use_redis: bool = True
     redis_job_ttl_seconds: int = 86400 * 7  # 7 days
+    redis_job_cache_ttl_seconds: float = 5.0  # In-process cache for status polls, 0 disables
 
     # Backend webhook configuration (for notifying Railway backend)
     backend_webhook_url: Optional[str] = None  # Set to your Railway backend URL
@@ -41,7 +41,8 @@ async def lifespan(app: FastAPI):
         try:
             job_store = RedisJobStore(
                 redis_url=settings.redis_url,
-                ttl_seconds=settings.redis_job_ttl_seconds
+                ttl_seconds=settings.redis_job_ttl_seconds,
+                cache_ttl_seconds=settings.redis_job_cache_ttl_seconds,
             )
             await job_store.connect()
             _logger.info("✅ Using Redis for persistent job storage")
@@ -61,6 +62,7 @@ async def lifespan(app: FastAPI):
             base_url=settings.ai4bharat_base_url,
             translate_path=settings.ai4bharat_translate_path,
             api_key=settings.ai4bharat_api_key,
+            decoding_profile=settings.ai4bharat_decoding_profile,
             max_retries=settings.max_retries,
             retry_backoff_factor=settings.retry_backoff_factor,
         )
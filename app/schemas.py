@@ -8,6 +8,7 @@ from pydantic import BaseModel, Field, HttpUrl, field_validator
 from app.services.job_store import JobStatus
 
 SUPPORTED_LANGUAGES = {"hi", "te", "ta", "ml", "bn", "gu", "mr", "pa", "en"}
+DECODING_PROFILES = {"fast", "balanced", "quality"}
 
 
 class TranslateTextRequest(BaseModel):
@@ -24,6 +25,10 @@ class TranslateTextRequest(BaseModel):
         description="Inference mode, e.g. translation or sentiment-analysis.",
         max_length=64,
     )
+    decoding_profile: Optional[str] = Field(
+        default=None,
+        description="Decoding profile: fast (greedy), balanced (beam 2) or quality (beam 5).",
+    )
 
     @field_validator("source_lang")
     def validate_source_language(cls, value: str) -> str:
@@ -35,6 +40,14 @@ class TranslateTextRequest(BaseModel):
     def validate_target_language(cls, value: str) -> str:
         return value.lower()
 
+    @field_validator("decoding_profile")
+    def validate_decoding_profile(cls, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return value
+        if value.lower() not in DECODING_PROFILES:
+            raise ValueError("Unsupported decoding profile.")
+        return value.lower()
+
 
 class TranslateTextResponse(BaseModel):
     """Response from the AI4Bharat translation endpoint."""
@@ -117,6 +130,28 @@ class VideoResultResponse(BaseModel):
     detail: Optional[str] = None
 
 
+class JobSummary(BaseModel):
+    """Job metadata returned by listing queries (without the source media)."""
+
+    job_id: str
+    status: JobStatus
+    language: str
+    video_url: Optional[str] = None
+    detail: Optional[str] = None
+    created_at: datetime
+    updated_at: datetime
+
+
+class JobListResponse(BaseModel):
+    """A page of jobs ordered by most recent update."""
+
+    jobs: List[JobSummary]
+    total: int
+    offset: int
+    limit: int
+    next_offset: Optional[int] = None
+
+
 class BanubaFilter(BaseModel):
     """Represents a Banuba AR filter exposed to the client."""
 
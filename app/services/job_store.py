@@ -6,7 +6,7 @@ import asyncio
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from enum import Enum
-from typing import Dict, Optional
+from typing import Dict, List, Optional, Tuple
 
 
 class JobStatus(str, Enum):
@@ -66,8 +66,12 @@ class JobStore:
         async with self._lock:
             self._jobs[record.job_id] = record
 
-    async def get(self, job_id: str) -> Optional[JobRecord]:
-        """Return job record if it exists."""
+    async def get(self, job_id: str, *, include_image: bool = True) -> Optional[JobRecord]:
+        """Return job record if it exists.
+
+        `include_image` is accepted for compatibility with RedisJobStore; the
+        in-memory store always returns the full record.
+        """
 
         async with self._lock:
             return self._jobs.get(job_id)
@@ -88,3 +92,23 @@ class JobStore:
                 return None
             record.update(status=status, video_url=video_url, detail=detail)
             return record
+
+    async def list_jobs(
+        self,
+        *,
+        status: Optional[JobStatus] = None,
+        updated_before: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> Tuple[List[JobRecord], int]:
+        """Return a page of jobs, most recently updated first, and the total match count."""
+
+        async with self._lock:
+            matches = [
+                record
+                for record in self._jobs.values()
+                if (status is None or record.status == status)
+                and (updated_before is None or record.updated_at < updated_before)
+            ]
+        matches.sort(key=lambda record: record.updated_at, reverse=True)
+        return matches[offset:offset + limit], len(matches)
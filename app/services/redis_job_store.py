@@ -2,50 +2,138 @@
 
 from __future__ import annotations
 
+import asyncio
+import hashlib
 import json
 import logging
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import replace
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, List, Optional, Tuple, Union
 
+import msgpack
 import redis.asyncio as redis
 
 from .job_store import JobRecord, JobStatus
 
 _logger = logging.getLogger(__name__)
 
+# Image URLs longer than this (base64 data URLs in image_data and video mode)
+# are stored once under a content-hash key instead of inside the record.
+_INLINE_IMAGE_MAX_BYTES = 1024
+
+# Patches fields of a stored record, refreshes its TTL and moves it in the
+# status and updated_at indexes in one atomic step. Every key the script touches
+# is declared in KEYS (for ACL key checks), but the keys share no hash tag, so
+# the store targets a single Redis node: on Redis Cluster the script fails with
+# CROSSSLOT. The TTL of an out-of-line image blob is refreshed by the caller
+# with a separate EXPIRE, outside the atomic step, as its key is only known once
+# the record is read (and blobs are shared between jobs by content hash).
+# Records written as JSON by earlier versions are converted to msgpack.
+# KEYS[1]: job key; KEYS[2]: updated_at index; KEYS[3..]: status indexes.
+# ARGV[1]: TTL in seconds; ARGV[2]: msgpack map of fields to set;
+# ARGV[3]: updated_at score; ARGV[4]: job id; ARGV[5]: invalidation channel;
+# ARGV[6]: invalidation message; ARGV[7..]: statuses of KEYS[3..].
+# Returns the updated record, or nil when the job does not exist.
+_UPDATE_SCRIPT = """
+local data = redis.call('GET', KEYS[1])
+if not data then
+    return false
+end
+local status_index_keys = {}
+for i = 3, #KEYS do
+    status_index_keys[ARGV[i + 4]] = KEYS[i]
+end
+local record
+if string.sub(data, 1, 1) == '{' then
+    record = cjson.decode(data)
+else
+    record = cmsgpack.unpack(data)
+end
+local old_status = record['status']
+for field, value in pairs(cmsgpack.unpack(ARGV[2])) do
+    record[field] = value
+end
+data = cmsgpack.pack(record)
+redis.call('SET', KEYS[1], data, 'EX', tonumber(ARGV[1]))
+if record['status'] ~= old_status and status_index_keys[old_status] then
+    redis.call('ZREM', status_index_keys[old_status], ARGV[4])
+end
+redis.call('ZADD', status_index_keys[record['status']], ARGV[3], ARGV[4])
+redis.call('ZADD', KEYS[2], ARGV[3], ARGV[4])
+redis.call('PUBLISH', ARGV[5], ARGV[6])
+return data
+"""
+
 
 class RedisJobStore:
     """Persistent job storage using Redis.
 
-    Stores job records as JSON strings with TTL for automatic cleanup.
+    Stores job records as msgpack maps with TTL for automatic cleanup.
+    Large image URLs (base64 data URLs) are stored out of line, once per
+    distinct image, under a key derived from their SHA-256 and are only
+    fetched by `get`; records returned by `update`, `list_jobs` and
+    `get(..., include_image=False)` have an empty `image_url` for them.
+    Updates are applied server-side by a Lua script, so concurrent updates of
+    the same job cannot overwrite each other's fields.
+    Job ids are indexed in sorted sets scored by `updated_at`, one for all jobs
+    and one per status, so listing queries do not scan the keyspace. Index
+    entries of expired records are pruned when jobs are listed.
+    Records read with `get(..., include_image=False)` are served from a
+    short-TTL in-process cache. Every write publishes the job id on a Redis
+    channel that all replicas subscribe to, so other replicas drop their copy;
+    the TTL bounds staleness if an invalidation is missed.
     Maintains backward compatibility with in-memory JobStore interface.
     """
 
-    def __init__(self, redis_url: str, ttl_seconds: int = 86400 * 7) -> None:
+    def __init__(
+        self,
+        redis_url: str,
+        ttl_seconds: int = 86400 * 7,
+        cache_ttl_seconds: float = 5.0,
+        cache_max_entries: int = 10000,
+    ) -> None:
         """
         Initialize Redis connection.
 
         Args:
             redis_url: Redis connection URL (e.g., redis://localhost:6379/0)
             ttl_seconds: Time-to-live for job records in seconds (default: 7 days)
+            cache_ttl_seconds: Lifetime of locally cached records, 0 disables
+                the cache (default: 5 seconds)
+            cache_max_entries: Maximum number of locally cached records
         """
         self.redis_url = redis_url
         self.ttl_seconds = ttl_seconds
         self._redis: Optional[redis.Redis] = None
+        self._update_script = None
         self._key_prefix = "pet_roast:job:"
+        self._updated_index_key = "pet_roast:jobs:by_updated"
+        self._status_index_prefix = "pet_roast:jobs:by_status:"
+        self._blob_prefix = "pet_roast:blob:"
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self.cache_max_entries = cache_max_entries
+        self._cache: "OrderedDict[str, Tuple[float, JobRecord]]" = OrderedDict()
+        # bumped on every invalidation, so reads that raced one are not cached
+        self._cache_epoch = 0
+        self._instance_id = uuid.uuid4().hex
+        self._invalidation_channel = "pet_roast:jobs:invalidate"
+        self._invalidation_listener: Optional[asyncio.Task] = None
 
     async def connect(self) -> None:
         """Establish Redis connection."""
         try:
-            self._redis = await redis.from_url(
-                self.redis_url,
-                encoding="utf-8",
-                decode_responses=True
-            )
+            # records are binary msgpack, so responses are not decoded
+            self._redis = await redis.from_url(self.redis_url)
             # Test connection
             pong = await self._redis.ping()  # type: ignore[misc]
             if not pong:
                 raise ConnectionError("Redis ping failed")
+            self._update_script = self._redis.register_script(_UPDATE_SCRIPT)
+            if self.cache_ttl_seconds > 0:
+                self._invalidation_listener = asyncio.create_task(self._listen_for_invalidations())
             _logger.info(f"✅ Connected to Redis at {self.redis_url}")
         except Exception as e:
             _logger.error(f"❌ Failed to connect to Redis: {e}")
@@ -53,6 +141,13 @@ class RedisJobStore:
 
     async def close(self) -> None:
         """Close Redis connection."""
+        if self._invalidation_listener:
+            self._invalidation_listener.cancel()
+            try:
+                await self._invalidation_listener
+            except asyncio.CancelledError:
+                pass
+            self._invalidation_listener = None
         if self._redis:
             await self._redis.aclose()
             _logger.info("Redis connection closed")
@@ -61,33 +156,132 @@ class RedisJobStore:
         """Generate Redis key for a job."""
         return f"{self._key_prefix}{job_id}"
 
-    def _serialize_record(self, record: JobRecord) -> str:
-        """Convert JobRecord to JSON string."""
-        return json.dumps({
+    def _status_index_key(self, status: JobStatus) -> str:
+        """Generate the Redis key of the index of jobs with a status."""
+        return f"{self._status_index_prefix}{status.value}"
+
+    async def _listen_for_invalidations(self) -> None:
+        """Drop cached records that other replicas changed, resubscribing on errors."""
+        while True:
+            try:
+                async with self._redis.pubsub() as pubsub:  # type: ignore[union-attr]
+                    await pubsub.subscribe(self._invalidation_channel)
+                    async for message in pubsub.listen():
+                        if message["type"] != "message":
+                            continue
+                        instance_id, _, job_id = message["data"].decode("utf-8").partition(":")
+                        if instance_id != self._instance_id:
+                            self._invalidate(job_id)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # invalidations may have been missed while disconnected
+                _logger.warning(f"Job cache invalidation listener failed: {e}. Resubscribing.")
+                self._cache.clear()
+                self._cache_epoch += 1
+                await asyncio.sleep(1)
+
+    def _invalidation_message(self, job_id: str) -> str:
+        return f"{self._instance_id}:{job_id}"
+
+    def _invalidate(self, job_id: str) -> None:
+        self._cache.pop(job_id, None)
+        self._cache_epoch += 1
+
+    def _cache_get(self, job_id: str) -> Optional[JobRecord]:
+        entry = self._cache.get(job_id)
+        if entry is None:
+            return None
+        expires_at, record = entry
+        if expires_at < time.monotonic():
+            del self._cache[job_id]
+            return None
+        self._cache.move_to_end(job_id)
+        # callers may mutate the returned record
+        return replace(record)
+
+    def _cache_put(self, record: JobRecord, epoch: Optional[int] = None) -> None:
+        """Cache a copy of a record.
+
+        Reads pass the epoch from before their Redis call and are not cached if
+        an invalidation happened since; writes (no epoch) count as one, so reads
+        that started before them cannot overwrite the written record.
+        """
+        if epoch is None:
+            self._cache_epoch += 1
+        elif epoch != self._cache_epoch:
+            return
+        if self.cache_ttl_seconds <= 0:
+            return
+        # the cache serves reads without images, do not keep large image URLs in memory
+        image_url = record.image_url if len(record.image_url) <= _INLINE_IMAGE_MAX_BYTES else ""
+        self._cache[record.job_id] = (
+            time.monotonic() + self.cache_ttl_seconds,
+            replace(record, image_url=image_url),
+        )
+        self._cache.move_to_end(record.job_id)
+        while len(self._cache) > self.cache_max_entries:
+            self._cache.popitem(last=False)
+
+    def _blob_key(self, content_hash: str) -> str:
+        """Generate Redis key for an out-of-line image blob."""
+        return f"{self._blob_prefix}{content_hash}"
+
+    def _serialize_record(self, record: JobRecord) -> Tuple[bytes, Optional[Tuple[str, bytes]]]:
+        """Convert JobRecord to msgpack bytes.
+
+        Returns:
+            The packed record and, for a large image URL, the (key, value) of
+            the blob it references.
+        """
+        obj: Dict[str, Any] = {
             "job_id": record.job_id,
             "status": record.status.value,
             "text": record.text,
-            "image_url": record.image_url,
             "language": record.language,
-            "video_url": record.video_url,
-            "detail": record.detail,
-            "created_at": record.created_at.isoformat(),
-            "updated_at": record.updated_at.isoformat(),
-        })
-
-    def _deserialize_record(self, data: str) -> JobRecord:
-        """Convert JSON string to JobRecord."""
-        obj = json.loads(data)
+            "created_at": record.created_at.timestamp(),
+            "updated_at": record.updated_at.timestamp(),
+        }
+        # absent fields are None, as Lua (cmsgpack) cannot keep nil map values anyway
+        if record.video_url is not None:
+            obj["video_url"] = record.video_url
+        if record.detail is not None:
+            obj["detail"] = record.detail
+
+        blob = None
+        image_bytes = record.image_url.encode("utf-8")
+        if len(image_bytes) > _INLINE_IMAGE_MAX_BYTES:
+            content_hash = hashlib.sha256(image_bytes).hexdigest()
+            obj["image_ref"] = content_hash
+            blob = (self._blob_key(content_hash), image_bytes)
+        else:
+            obj["image_url"] = record.image_url
+        return msgpack.packb(obj), blob
+
+    def _unpack(self, data: bytes) -> Dict[str, Any]:
+        """Decode a stored record, accepting JSON records of earlier versions."""
+        if data[:1] == b"{":
+            return json.loads(data)
+        return msgpack.unpackb(data)
+
+    def _deserialize_record(self, data: Union[bytes, Dict[str, Any]], image_url: str = "") -> JobRecord:
+        """Convert a stored record to JobRecord.
+
+        Args:
+            data: Packed record, or a record already decoded by `_unpack`
+            image_url: Image URL to use when the record references a blob
+        """
+        obj = self._unpack(data) if isinstance(data, bytes) else data
         return JobRecord(
             job_id=obj["job_id"],
             status=JobStatus(obj["status"]),
             text=obj["text"],
-            image_url=obj["image_url"],
+            image_url=obj.get("image_url", image_url),
             language=obj["language"],
             video_url=obj.get("video_url"),
             detail=obj.get("detail"),
-            created_at=datetime.fromisoformat(obj["created_at"]),
-            updated_at=datetime.fromisoformat(obj["updated_at"]),
+            created_at=_parse_timestamp(obj["created_at"]),
+            updated_at=_parse_timestamp(obj["updated_at"]),
         )
 
     async def upsert(self, record: JobRecord) -> None:
@@ -96,22 +290,60 @@ class RedisJobStore:
             raise RuntimeError("Redis not connected. Call connect() first.")
 
         key = self._make_key(record.job_id)
-        data = self._serialize_record(record)
-        await self._redis.setex(key, self.ttl_seconds, data)
+        data, blob = self._serialize_record(record)
+        # an image already stored by an earlier write only needs its TTL refreshed
+        store_blob = blob is not None and not await self._redis.expire(blob[0], self.ttl_seconds)
+        score = record.updated_at.timestamp()
+        async with self._redis.pipeline(transaction=True) as pipe:
+            if store_blob:
+                pipe.set(blob[0], blob[1], ex=self.ttl_seconds)  # type: ignore[index]
+            pipe.setex(key, self.ttl_seconds, data)
+            # the previous status is unknown here, drop the job from every status index
+            for job_status in JobStatus:
+                if job_status != record.status:
+                    pipe.zrem(self._status_index_key(job_status), record.job_id)
+            pipe.zadd(self._status_index_key(record.status), {record.job_id: score})
+            pipe.zadd(self._updated_index_key, {record.job_id: score})
+            pipe.publish(self._invalidation_channel, self._invalidation_message(record.job_id))
+            await pipe.execute()
+        self._cache_put(record)
         _logger.debug(f"Stored job {record.job_id} with status {record.status}")
 
-    async def get(self, job_id: str) -> Optional[JobRecord]:
-        """Retrieve job record by ID."""
+    async def get(self, job_id: str, *, include_image: bool = True) -> Optional[JobRecord]:
+        """Retrieve job record by ID.
+
+        Args:
+            job_id: Job identifier
+            include_image: Fetch an out-of-line image URL; status lookups that
+                do not need it skip the extra round-trip and transfer and may
+                be served from the local cache
+        """
         if not self._redis:
             raise RuntimeError("Redis not connected. Call connect() first.")
 
+        if not include_image:
+            cached = self._cache_get(job_id)
+            if cached is not None:
+                return cached
+
+        epoch = self._cache_epoch
         key = self._make_key(job_id)
         data = await self._redis.get(key)
 
         if data is None:
             return None
 
-        return self._deserialize_record(data)
+        obj = self._unpack(data)
+        image_url = ""
+        if include_image and "image_ref" in obj:
+            blob = await self._redis.get(self._blob_key(obj["image_ref"]))
+            if blob is None:
+                _logger.warning(f"Image blob {obj['image_ref']} of job {job_id} has expired")
+            else:
+                image_url = blob.decode("utf-8")
+        record = self._deserialize_record(obj, image_url)
+        self._cache_put(record, epoch)
+        return record
 
     async def update(
         self,
@@ -121,25 +353,50 @@ class RedisJobStore:
         video_url: Optional[str] = None,
         detail: Optional[str] = None,
     ) -> Optional[JobRecord]:
-        """Update existing job record and return updated record."""
-        if not self._redis:
-            raise RuntimeError("Redis not connected. Call connect() first.")
+        """Update existing job record and return updated record.
 
-        record = await self.get(job_id)
-        if record is None:
-            return None
+        The changed fields are patched into the stored record and its TTL is
+        refreshed by a Lua script in a single round-trip; records with an
+        out-of-line image take a second one to refresh the TTL of the blob.
+        That EXPIRE is not atomic with the script: if it is lost, the blob
+        keeps its previous TTL and `get` reports the image as expired once it
+        lapses.
+        """
+        if not self._redis or self._update_script is None:
+            raise RuntimeError("Redis not connected. Call connect() first.")
 
-        # Apply updates
+        updated_at = datetime.now(timezone.utc)
+        fields: Dict[str, Any] = {"updated_at": updated_at.timestamp()}
         if status is not None:
-            record.status = status
+            fields["status"] = status.value
         if video_url is not None:
-            record.video_url = video_url
+            fields["video_url"] = video_url
         if detail is not None:
-            record.detail = detail
-        record.updated_at = datetime.now(timezone.utc)
+            fields["detail"] = detail
 
-        # Save updated record
-        await self.upsert(record)
+        key = self._make_key(job_id)
+        data = await self._update_script(
+            keys=[key, self._updated_index_key] + [
+                self._status_index_key(job_status) for job_status in JobStatus
+            ],
+            args=[
+                self.ttl_seconds,
+                msgpack.packb(fields),
+                updated_at.timestamp(),
+                job_id,
+                self._invalidation_channel,
+                self._invalidation_message(job_id),
+            ] + [job_status.value for job_status in JobStatus],
+        )
+        if data is None:
+            return None
+
+        obj = self._unpack(data)
+        if "image_ref" in obj:
+            await self._redis.expire(self._blob_key(obj["image_ref"]), self.ttl_seconds)
+        _logger.debug(f"Updated job {job_id} fields {sorted(fields)}")
+        record = self._deserialize_record(obj)
+        self._cache_put(record)
         return record
 
     async def delete(self, job_id: str) -> bool:
@@ -148,7 +405,14 @@ class RedisJobStore:
             raise RuntimeError("Redis not connected. Call connect() first.")
 
         key = self._make_key(job_id)
-        result = await self._redis.delete(key)
+        async with self._redis.pipeline(transaction=True) as pipe:
+            pipe.delete(key)
+            pipe.zrem(self._updated_index_key, job_id)
+            for job_status in JobStatus:
+                pipe.zrem(self._status_index_key(job_status), job_id)
+            pipe.publish(self._invalidation_channel, self._invalidation_message(job_id))
+            result, *_ = await pipe.execute()
+        self._invalidate(job_id)
         return result > 0
 
     async def exists(self, job_id: str) -> bool:
@@ -159,3 +423,54 @@ class RedisJobStore:
         key = self._make_key(job_id)
         result = await self._redis.exists(key)
         return result > 0
+
+    async def list_jobs(
+        self,
+        *,
+        status: Optional[JobStatus] = None,
+        updated_before: Optional[datetime] = None,
+        offset: int = 0,
+        limit: int = 50,
+    ) -> Tuple[List[JobRecord], int]:
+        """Return a page of jobs, most recently updated first, and the total match count.
+
+        Args:
+            status: Only list jobs with this status
+            updated_before: Only list jobs last updated before this time,
+                e.g. to find stale processing jobs
+            offset: Number of matching jobs to skip
+            limit: Maximum number of jobs to return
+        """
+        if not self._redis:
+            raise RuntimeError("Redis not connected. Call connect() first.")
+
+        index_key = self._status_index_key(status) if status is not None else self._updated_index_key
+        max_score = f"({updated_before.timestamp()}" if updated_before is not None else "+inf"
+        # records expire through their TTL, entries older than the TTL are stale
+        expired_score = f"({datetime.now(timezone.utc).timestamp() - self.ttl_seconds}"
+
+        async with self._redis.pipeline(transaction=False) as pipe:
+            pipe.zremrangebyscore(index_key, "-inf", expired_score)
+            pipe.zcount(index_key, "-inf", max_score)
+            pipe.zrevrangebyscore(index_key, max_score, "-inf", start=offset, num=limit)
+            _, total, job_ids = await pipe.execute()
+        job_ids = [job_id.decode("utf-8") for job_id in job_ids]
+
+        if not job_ids:
+            return [], total
+
+        values = await self._redis.mget([self._make_key(job_id) for job_id in job_ids])
+        records = [self._deserialize_record(data) for data in values if data is not None]
+        missing = [job_id for job_id, data in zip(job_ids, values) if data is None]
+        if missing:
+            # deleted or expired early, e.g. after a TTL change
+            await self._redis.zrem(index_key, *missing)
+            _logger.debug(f"Pruned {len(missing)} stale entries from {index_key}")
+        return records, total
+
+
+def _parse_timestamp(value: Union[float, str]) -> datetime:
+    """Parse a stored timestamp: epoch seconds, or ISO format in JSON records of earlier versions."""
+    if isinstance(value, str):
+        return datetime.fromisoformat(value)
+    return datetime.fromtimestamp(value, tz=timezone.utc)